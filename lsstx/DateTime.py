@@ -1,8 +1,14 @@
 from __future__ import print_function, division, absolute_import
+import bisect
+import datetime
 import re
+import time
 from enum import Enum, unique
+from operator import attrgetter, index
 
-from astropy.time import Time, TimeUnix, TimeFromEpoch, TimeDelta
+import numpy as np
+from astropy.time import Time, TimeUnix, TimeFromEpoch
+from astropy.utils import iers
 
 """
 Reimplementation of some of daf_base.DateTime using astropy.time
@@ -24,6 +30,44 @@ class DateSystem(Enum):
     EPOCH = 2  # Assumes Julian Epoch
 
 
+# String and integer types accepted by the constructor
+try:
+    _STR_TYPES = (basestring,)
+    _INT_TYPES = (int, long)
+except NameError:
+    # Python 3
+    _STR_TYPES = (str,)
+    _INT_TYPES = (int,)
+
+# Translation of enums to astropy scale names, format names and value getters
+_SCALE_TO_ASTROPY = {Timescale.TAI: "tai", Timescale.UTC: "utc", Timescale.TT: "tt"}
+_SYSTEM_TO_ASTROPY = {DateSystem.JD: "jd", DateSystem.MJD: "mjd", DateSystem.EPOCH: "jyear"}
+_FORMAT_GETTERS = {system: attrgetter(name) for system, name in _SYSTEM_TO_ASTROPY.items()}
+
+# Current UTC time as integer nanoseconds since the unix epoch
+try:
+    _time_ns = time.time_ns
+except AttributeError:
+    # Python < 3.7
+    def _time_ns():
+        return int(time.time() * 1e9)
+
+# daf_base supports a compact string form that is not supported
+# directly by Astropy: YYYYMMDDTHHMMSSZ, optional with decimal fraction
+_COMPACT_ISO_RE = re.compile(r"(\d{4})(\d{2})(\d{2})T(\d{2})(\d{2})(\d{2})(\.\d+)?Z")
+
+# Start offsets of the year, month, day, hour, minute and second fields,
+# followed by the end of the seconds, for the extended and compact
+# ISO 8601 forms parsed by _parse_iso()
+_ISO_EXTENDED_OFFSETS = (0, 5, 8, 11, 14, 17, 19)
+_ISO_COMPACT_OFFSETS = (0, 4, 6, 9, 11, 13, 15)
+_ISO_SEPARATORS = {
+    _ISO_EXTENDED_OFFSETS: ((4, "-"), (7, "-"), (10, "T"), (13, ":"), (16, ":")),
+    _ISO_COMPACT_OFFSETS: ((8, "T"),),
+}
+_UNIX_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
 class TimeTAISinceUnix(TimeUnix):
     """
     Unix time: TAI seconds from 1970-01-01 00:00:00 UTC.
@@ -69,6 +113,118 @@ class TimeLSSTNano(TimeFromEpoch):
     epoch_format = "mjd"
 
 
+def _initialize_time_formats():
+    """
+    Construct a Time in each of the custom formats so that astropy
+    computes and caches the epoch of each format class at import rather
+    than on first use.
+    """
+    for format, scale in (("taiunix", "tai"), ("ttunix", "tt"), ("utcunix", "utc"), ("lsstnsec", "utc")):
+        Time(0, format=format, scale=scale)
+
+
+_initialize_time_formats()
+
+
+def _make_leap_second_table():
+    """
+    Read the IERS leap second table and return two parallel lists: the UTC
+    unix seconds at which each TAI-UTC offset starts to apply, and the
+    integer TAI-UTC offset itself. Only covers the integer leap second era
+    starting in 1972.
+    """
+    table = iers.LeapSeconds.auto_open()
+    starts = [int(mjd - 40587) * 86400 for mjd in table["mjd"]]
+    offsets = [int(offset) for offset in table["tai_utc"]]
+    return starts, offsets
+
+
+# Read once at import so that conversions do not need to go through
+# astropy.time for the integer TAI-UTC offset.
+_LEAP_UNIX_STARTS, _LEAP_TAI_UTC = _make_leap_second_table()
+_LEAP_TAI_STARTS = [start + offset for start, offset in zip(_LEAP_UNIX_STARTS, _LEAP_TAI_UTC)]
+
+# numpy versions of the tables for the array conversions, so that
+# np.searchsorted does not convert the lists on every call. The scalar
+# conversions use bisect on the lists to avoid numpy call overhead.
+_LEAP_UNIX_STARTS_ARRAY = np.array(_LEAP_UNIX_STARTS, dtype=np.int64)
+_LEAP_TAI_STARTS_ARRAY = np.array(_LEAP_TAI_STARTS, dtype=np.int64)
+_LEAP_TAI_UTC_ARRAY = np.array(_LEAP_TAI_UTC, dtype=np.int64)
+
+
+def _tai_minus_utc(unix_secs):
+    """
+    Integer TAI-UTC offset applicable at the supplied UTC unix seconds.
+    Only valid after 1972.
+    """
+    return _LEAP_TAI_UTC[bisect.bisect_right(_LEAP_UNIX_STARTS, unix_secs) - 1]
+
+
+def _tai_minus_utc_from_tai(taiunix_secs):
+    """
+    Integer TAI-UTC offset applicable at the supplied TAI unix seconds.
+    Only valid after 1972.
+    """
+    return _LEAP_TAI_UTC[bisect.bisect_right(_LEAP_TAI_STARTS, taiunix_secs) - 1]
+
+
+def _parse_iso(isostr):
+    """
+    Parse an ISO 8601 UTC string in either the extended
+    (YYYY-MM-DDTHH:MM:SS.sssZ) or the daf_base compact (YYYYMMDDTHHMMSS.sssZ)
+    form, with optional fractional seconds, into integer UTC nanoseconds
+    since the unix epoch. Digits beyond nanoseconds are truncated.
+
+    Returns None if the string is not in one of those forms or refers to a
+    leap second, in which case it should be handed to astropy.
+    """
+    if len(isostr) < 16 or isostr[-1] != "Z":
+        return None
+    offsets = _ISO_EXTENDED_OFFSETS if isostr[4] == "-" else _ISO_COMPACT_OFFSETS
+    end = offsets[-1]
+    if len(isostr) < end + 1:
+        return None
+    for i, c in _ISO_SEPARATORS[offsets]:
+        if isostr[i] != c:
+            return None
+
+    fields = []
+    for start, stop in zip(offsets[:-1], (4, 2, 2, 2, 2, 2)):
+        digits = isostr[start:start + stop]
+        if not digits.isdigit():
+            return None
+        fields.append(int(digits))
+    year, month, day, hour, minute, second = fields
+
+    nsecs = 0
+    tail = isostr[end:-1]
+    if tail:
+        digits = tail[1:10]
+        if tail[0] != "." or not tail[1:].isdigit():
+            return None
+        nsecs = int(digits) * 10**(9 - len(digits))
+
+    if hour > 23 or minute > 59 or second > 59:
+        return None
+    try:
+        days = datetime.date(year, month, day).toordinal() - _UNIX_EPOCH_ORDINAL
+    except ValueError:
+        return None
+    return (((days * 24 + hour) * 60 + minute) * 60 + second) * 10**9 + nsecs
+
+
+def _jd_to_nsecs(jd1, jd2):
+    """
+    Convert two-part Julian Dates to integer nanoseconds since the unix
+    epoch in the same time scale. Works on arrays without losing
+    precision to a single float.
+    """
+    day = np.round(jd1)
+    frac = (jd1 - day) + jd2 - 0.5
+    return ((day - 2440587).astype(np.int64) * 86400 * 10**9 +
+            np.round(frac * 86400e9).astype(np.int64))
+
+
 class DateTime(object):
     # The Python API requires the enums are class attributes of DateTime
     JD = DateSystem.JD
@@ -78,13 +234,90 @@ class DateTime(object):
     UTC = Timescale.UTC
     TT = Timescale.TT
     _EPOCH_INTEGER_LEAP = 63072000
+    # Debug output is stripped entirely when running with python -O
     DEBUG = False
+    # Integer to enum translation, indexed by enum value
+    _SYS_LUT = (DateSystem.JD, DateSystem.MJD, DateSystem.EPOCH)
+    _SCALE_LUT = (Timescale.TAI, Timescale.UTC, Timescale.TT)
+
+    # The only per-instance state is the astropy Time
+    __slots__ = ("_internal",)
+
+    @classmethod
+    def now(cls):
+        # Integer nanoseconds go through the leap second table rather than
+        # a floating point astropy Time
+        return cls(_time_ns(), Timescale.UTC)
+
+    @classmethod
+    def from_nsecs_array(cls, nsecs, scale=Timescale.TAI):
+        """
+        Create a single DateTime holding an array of times from an array
+        of integer nanoseconds since epoch. All the conversions are done
+        by a single astropy Time rather than one per element.
+
+        Only get(), mjd() and nsecs_array() support array DateTimes.
+
+        dt = DateTime.from_nsecs_array(nsecs, DateTime.UTC)
+        """
+        scale = cls._import_scale(scale)
+        # A scalar becomes a single element array
+        nsecs = np.atleast_1d(np.asarray(nsecs, dtype=np.int64))
+        secs = nsecs // 10**9
+        fraction = (nsecs - secs * 10**9) / 1e9
+        if scale is Timescale.TAI:
+            t = Time(secs, fraction, format="taiunix", scale="tai", precision=9)
+        elif scale is Timescale.UTC:
+            deltat = _LEAP_TAI_UTC_ARRAY[
+                np.searchsorted(_LEAP_UNIX_STARTS_ARRAY, secs, side="right") - 1].astype(np.float64)
+            # Before 1972 TAI-UTC is not an integer so we have to ask astropy.time
+            early = secs <= DateTime._EPOCH_INTEGER_LEAP
+            if early.any():
+                ttmp = Time(secs[early], fraction[early], format="unix", scale="utc")
+                deltat[early] = ttmp.taiunix - ttmp.unix
+            t = Time(secs + deltat, fraction, format="taiunix", scale="tai", precision=9)
+        elif scale is Timescale.TT:
+            t = Time(secs, fraction, format="ttunix", scale="tt", precision=9)
+        else:
+            raise ValueError("Unsupported timescale argument")
+
+        t = t.tai
+        t.format = "mjd"
+        return cls._wrap(t)
+
+    @classmethod
+    def mjd_utc_to_nsecs_array(cls, mjds, scale=Timescale.TAI):
+        """
+        Convert an array of UTC MJDs to an int64 array of nanoseconds since
+        epoch in the requested time scale, following the same conventions
+        as nsecs(). All elements are converted in one go.
+
+        nsecs = DateTime.mjd_utc_to_nsecs_array(mjds, DateTime.UTC)
+        """
+        t = Time(np.asarray(mjds, dtype=np.float64), format="mjd", scale="utc").tai
+        return cls._wrap(t).nsecs_array(scale)
 
     @classmethod
-    def now(self):
-        t = Time.now()
-        t.precision = 9
-        return DateTime(t)
+    def batch(cls, nsecs, scale=Timescale.TAI):
+        """
+        Create a list of scalar DateTime objects from an array of integer
+        nanoseconds since epoch. The conversion is done once for the whole
+        array by from_nsecs_array() and each DateTime wraps one element.
+
+        dts = DateTime.batch(nsecs, DateTime.UTC)
+        """
+        t = cls.from_nsecs_array(nsecs, scale)._internal
+        return [cls._wrap(element) for element in t]
+
+    @classmethod
+    def _wrap(cls, t):
+        """
+        Create a DateTime directly from a TAI MJD astropy Time without
+        copying it.
+        """
+        new = cls.__new__(cls)
+        new._internal = t
+        return new
 
     @classmethod
     def _import_date_system(cls, system):
@@ -96,9 +329,13 @@ class DateTime(object):
         """
         if isinstance(system, DateSystem):
             return system
-        sys_lut = {0: DateSystem.JD, 1: DateSystem.MJD, 2: DateSystem.EPOCH}
-        if system in sys_lut:
-            return sys_lut[system]
+        # Any integer type, including numpy integers, is acceptable
+        try:
+            code = index(system)
+        except TypeError:
+            code = None
+        if code is not None and 0 <= code < len(cls._SYS_LUT):
+            return cls._SYS_LUT[code]
         raise ValueError("Supplied date systen value ({}) is not valid".format(system))
 
     @classmethod
@@ -111,9 +348,13 @@ class DateTime(object):
         """
         if isinstance(scale, Timescale):
             return scale
-        scale_lut = {0: Timescale.TAI, 1: Timescale.UTC, 2: Timescale.TT}
-        if scale in scale_lut:
-            return scale_lut[scale]
+        # Any integer type, including numpy integers, is acceptable
+        try:
+            code = index(scale)
+        except TypeError:
+            code = None
+        if code is not None and 0 <= code < len(cls._SCALE_LUT):
+            return cls._SCALE_LUT[code]
         raise ValueError("Supplied scale value ({}) is not valid".format(scale))
 
     @classmethod
@@ -121,46 +362,39 @@ class DateTime(object):
         """
         Convert a Timescale enum to the equivalent astropy string.
         """
-        if not isinstance(scale, Timescale):
+        scalestr = _SCALE_TO_ASTROPY.get(scale)
+        if scalestr is None:
             raise ValueError("Supplied timescale is not a Timescale enum")
-        return scale.name.lower()
+        return scalestr
 
     @classmethod
     def _system_to_astropy(cls, system):
         """
         Convert a DateSystem enum to the equivalent astropy string.
         """
-        if not isinstance(system, DateSystem):
+        sysstr = _SYSTEM_TO_ASTROPY.get(system)
+        if sysstr is None:
             raise ValueError("Supplied system is not a DateSystem enum")
-        if system in (DateSystem.MJD, DateSystem.JD):
-            sysstr = system.name.lower()
-        elif system is DateSystem.EPOCH:
-            sysstr = "jyear"
-        else:
-            raise ValueError("Supplied system enum is not recognized: {}".format(system))
         return sysstr
 
     def _in_timescale(self, scale):
-        if scale is Timescale.UTC:
-            t = self._internal.utc
-        elif scale is Timescale.TAI:
-            t = self._internal.tai
-        elif scale is Timescale.TT:
-            t = self._internal.tt
-        else:
+        # The internal representation is always TAI
+        if scale is Timescale.TAI:
+            return self._internal
+        scalestr = _SCALE_TO_ASTROPY.get(scale)
+        if scalestr is None:
             raise ValueError("Unexpected time scale provided: {}".format(scale))
-        return t
+        return getattr(self._internal, scalestr)
 
     def _in_format(self, t, system):
-        if system is DateSystem.MJD:
-            f = t.mjd
-        elif system is DateSystem.JD:
-            f = t.jd
-        elif system is DateSystem.EPOCH:
-            f = t.jyear
-        else:
+        # The internal representation is always MJD so the stored value
+        # can be returned without a format conversion
+        if system is DateSystem.MJD and t.format == "mjd":
+            return t.value
+        getter = _FORMAT_GETTERS.get(system)
+        if getter is None:
             raise ValueError("Unexpected data system provided: {}".format(system))
-        return f
+        return getter(t)
 
     # Python2 does not let us use (*arg, system=X, scale=Y) argument style
     def __init__(self, *args, **kwargs):
@@ -179,12 +413,13 @@ class DateTime(object):
 
         If no arguments are supplied the constructor will assume 0 nanoseconds.
         """
-        if self.DEBUG:
+        if __debug__ and self.DEBUG:
             print("Entering DateTime constructor with {} arguments".format(len(args)))
             print("Args", args)
         if len(args):
             if isinstance(args[0], Time):
-                self._internal = args[0].copy(format="mjd")
+                self._internal = args[0].tai.copy(format="mjd")
+                self._internal.precision = 9
                 return
         else:
             # Assume 0 nanoseconds if no arguments at al
@@ -209,90 +444,87 @@ class DateTime(object):
         format = "isot"
         scale = self._scale_to_astropy(kwargs["scale"])
         time_arg = None
-        fraction = None
-        if self.DEBUG:
+        time_arg2 = None
+        if __debug__ and self.DEBUG:
             print("Arg:", args[0], "Scale=", scale)
         if len(args) == 1:
+            arg = args[0]
+            if isinstance(arg, _STR_TYPES):
+                # Strings in the integer leap second era are parsed directly
+                # into UTC nanoseconds and then handled as an integer
+                nsecs = _parse_iso(arg)
+                if nsecs is not None and nsecs // 10**9 > DateTime._EPOCH_INTEGER_LEAP:
+                    arg = nsecs
+                    kwargs["scale"] = Timescale.UTC
+                    scale = "utc"
+
             # in current compatibility scheme have to look for string vs float vs int types
-            if isinstance(args[0], basestring):
-                time_arg = args[0]
+            if isinstance(arg, _STR_TYPES):
+                time_arg = arg
                 scale = "utc"
-                # daf_base supports a compact string form that is not supported
-                # directly by Astropy: YYYYMMDDTHHMMSSZ, optional with decimal fraction
-                # we have to translate it before it hits astropy
-                matcher = re.compile(r"(\d{4})(\d{2})(\d{2})T(\d{2})(\d{2})(\d{2})(\.\d+)?Z")
-                matched = matcher.search(time_arg)
+                # Translate the compact daf_base form before it hits astropy
+                matched = _COMPACT_ISO_RE.search(time_arg)
                 if matched:
                     parts = matched.groups()
                     time_arg = "{0}-{1}-{2}T{3}:{4}:{5}".format(*parts[0:6])
                     if parts[6] is not None:
                         time_arg += parts[6]
-            elif isinstance(args[0], long) or isinstance(args[0], int):
+            elif isinstance(arg, _INT_TYPES):
                 # Astropy does not have a nanosec representation
                 # for now we risk losing precision
                 # "unix" does not work properly for leap days (the extra second is spread out over the day)
                 # so we have to work out the TAI delta and specify
                 # TAI epoch seconds
 
-                # Fractions of seconds will be tracked separately as Astropy does not handle
-                # nanosecond integers natively.
+                # Fractions of seconds are passed as the second part of a two-part
+                # Time as Astropy does not handle nanosecond integers natively.
 
-                nsecs = args[0]
-                fraction = int(str(abs(nsecs))[-9:])
-                fracpositive = False if nsecs < 0 else True
-                time_arg = int(nsecs/1e9)
+                # Floor division leaves a fraction that is never negative so
+                # no special handling is needed for times before the epoch.
+                time_arg, fraction = divmod(arg, 10**9)
+                time_arg2 = fraction / 1e9
                 if kwargs["scale"] is Timescale.TAI:
                     format = "taiunix"
                 elif kwargs["scale"] is Timescale.UTC:
                     format = "taiunix"
-                    ttmp = Time(time_arg, format="unix", scale="utc")
-                    deltat = ttmp.taiunix - ttmp.unix
-                    # Massive hack here: since "unix" seconds are not real seconds
-                    # on leap days we have to force deltat to be an integer. This
-                    # is broken before 1972. Need to obtain actual TAI-UTC offset from astropy.time.
                     if time_arg > DateTime._EPOCH_INTEGER_LEAP:
-                        deltat = int(deltat + 0.5)
+                        deltat = _tai_minus_utc(time_arg)
+                    else:
+                        # Before 1972 TAI-UTC is not an integer so we have to
+                        # ask astropy.time. This is not reliable.
+                        ttmp = Time(time_arg, time_arg2, format="unix", scale="utc")
+                        deltat = ttmp.taiunix - ttmp.unix
                     time_arg += deltat
                 elif kwargs["scale"] is Timescale.TT:
                     format = "ttunix"
                 else:
                     raise ValueError("Unsupported timescale argument")
 
-            elif isinstance(args[0], float):
+            elif isinstance(arg, float):
                 format = self._system_to_astropy(kwargs["system"])
-                time_arg = args[0]
+                time_arg = arg
             else:
-                raise ValueError("Can not work out what first argument is for DateTime: {}".format(args[0]))
+                raise ValueError("Can not work out what first argument is for DateTime: {}".format(arg))
         elif len(args) == 6:
             # Put content into an ISO 8601 string and use that
-            time_arg = "{:04}-{:02}-{:02}T{:02}:{:02}:{:02}".format(*args)
+            year, month, day, hour, minute, second = args
+            time_arg = "%04d-%02d-%02dT%02d:%02d:" % (year, month, day, hour, minute)
+            if isinstance(second, _INT_TYPES + (np.integer,)):
+                time_arg += "%02d" % second
+            else:
+                time_arg += "%012.9f" % float(second)
             format = "isot"
         else:
             raise ValueError("Unexpected number of arguments in DateTime constructor")
-        if self.DEBUG:
+        if __debug__ and self.DEBUG:
             print("Time Arg: {0!r}".format(time_arg))
-        self._internal = Time(time_arg, format=format, scale=scale, precision=9)
-
-        # Handle fractional nanoseconds. Experiment with two approaches. For
-        # positive fractions we reparse an ISO format date. For negative
-        # fractions we use a TimeDelta object.
-        if fraction is not None and fraction != 0:
-            t = self._internal
-            if fracpositive:
-                t.precision = 0
-                isostring = "{}.{:09d}".format(t.isot, fraction)
-                if self.DEBUG:
-                    print("Adjusting fractional seconds as string: {}", isostring)
-                self._internal = Time(isostring, format="isot", scale=scale, precision=9)
-            else:
-                secs = float("0.{:09d}".format(fraction))
-                ts = scale if scale != "utc" else "tai"
-                td = TimeDelta(secs, format="sec", scale=ts)
-                if self.DEBUG:
-                    print("Adjusting fractional seconds negative: {}", td)
-                self._internal -= td
-
-        if self.DEBUG:
+        self._internal = Time(time_arg, time_arg2, format=format, scale=scale, precision=9)
+
+        # Always store as TAI MJD so that we never have to copy on output
+        self._internal = self._internal.tai
+        self._internal.format = "mjd"
+
+        if __debug__ and self.DEBUG:
             print("Internal: ", repr(self._internal.copy(format="isot").utc))
             print("Internal: ", repr(self._internal.copy(format="isot").tai))
             print("Internal: ", repr(self._internal.copy(format="isot").tt))
@@ -320,7 +552,7 @@ class DateTime(object):
 
         TT not yet supported
         """
-        if self.DEBUG:
+        if __debug__ and self.DEBUG:
             print("Entering nsecs() method:", args)
         if len(args) and args[0] is Timescale.TT:
             raise ValueError("nsecs() does not yet support TT timescale")
@@ -330,30 +562,48 @@ class DateTime(object):
         else:
             scale = Timescale.TAI
 
-        # Asking for the unix epoch numbers in nanosecond precision
-        # is prone to error. So we get the integer part and then
-        # request the fractional second by stringifying and relying on
-        # astropy time internals to handle precision.
-        t = self._internal.copy(format="mjd")
+        # Asking for the unix epoch numbers as a float loses nanosecond
+        # precision so we work from the two-part Julian Date instead.
+        t = self._internal
+        nsecs = int(_jd_to_nsecs(t.jd1, t.jd2))
 
-        if scale is Timescale.TAI:
-            integer = int(t.taiunix)
-        elif scale is Timescale.UTC:
-            integer = int(t.unix)
-        else:
+        if scale is Timescale.UTC:
+            secs = nsecs // 10**9
+            if secs >= _LEAP_TAI_STARTS[0]:
+                nsecs -= _tai_minus_utc_from_tai(secs) * 10**9
+            else:
+                # Prior to 1972 we use astropy UTC and hope for the best
+                tutc = t.utc
+                nsecs = int(_jd_to_nsecs(tutc.jd1, tutc.jd2))
+        elif scale is not Timescale.TAI:
             raise ValueError("Unexpected timescale in nsecs call")
 
-        # We always ask for the ISO form in TAI after 1972 as we are solely interested
-        # in the fractional seconds and the offset is an integer. Prior to 1972 we use
-        # UTC and hope for the best.
-        t.precision = 9
-        if t.unix > DateTime._EPOCH_INTEGER_LEAP:
-            iso = t.tai.isot
-        else:
-            iso = t.utc.isot
-        if self.DEBUG:
-            print("NSECS String:", iso, " >> ", integer, ".", iso[20:29])
-        return long(str(integer) + iso[20:29] + "L")
+        if __debug__ and self.DEBUG:
+            print("NSECS:", nsecs)
+        return nsecs
+
+    def nsecs_array(self, scale=Timescale.TAI):
+        """
+        Return the nanosecs in epoch as an int64 numpy array. Works for
+        DateTime objects created with from_nsecs_array() and follows the
+        same conventions as nsecs().
+        """
+        scale = self._import_scale(scale)
+        if scale is Timescale.TT:
+            raise ValueError("nsecs_array() does not yet support TT timescale")
+
+        t = self._internal
+        nsecs = _jd_to_nsecs(t.jd1, t.jd2)
+        if scale is Timescale.UTC:
+            secs = nsecs // 10**9
+            offsets = _LEAP_TAI_UTC_ARRAY[np.searchsorted(_LEAP_TAI_STARTS_ARRAY, secs, side="right") - 1]
+            nsecs = nsecs - offsets * 10**9
+            # Prior to 1972 we use astropy UTC and hope for the best
+            early = secs < _LEAP_TAI_STARTS[0]
+            if early.any():
+                tutc = t[early].utc
+                nsecs[early] = _jd_to_nsecs(tutc.jd1, tutc.jd2)
+        return nsecs
 
     def get(self, *args):
         """
@@ -397,13 +647,9 @@ class DateTime(object):
         return self._internal != rhs._internal
 
     def __str__(self):
-        t = self._internal.copy(format="isot").utc
-        t.precision = 9
-        iso = t.isot
-        # daf_base seems to want the Z added if we have a UTC time
-        if t.scale == "utc":
-            iso = iso + "Z"
-        return iso
+        # daf_base wants the Z added and we always report UTC. The UTC Time
+        # is cached by astropy and inherits the precision of the internal Time.
+        return self._internal.utc.isot + "Z"
 
     def __repr__(self):
         # We report with TAI nanoseconds
@@ -417,6 +663,7 @@ class DateTime(object):
 
         @param timescale  Timescale for resultant datetime
         """
-        import datetime
         nsecs = self.nsecs(timescale) if timescale is not None else self.nsecs()
-        return datetime.datetime.utcfromtimestamp(nsecs/10**9)
+        # Keep the division in integers so that precision is not lost to a float
+        return (datetime.datetime.utcfromtimestamp(nsecs // 10**9) +
+                datetime.timedelta(microseconds=(nsecs % 10**9) // 1000))
@@ -26,12 +26,27 @@ Helper routines for lsstx
 """
 import numpy as np
 
+# Default for getattr() that can not be confused with an attribute value
+_NOT_WRAPPED = object()
+
 
 def swigify(args):
     """
     Convert the argument list to swig arguments as required.
+
+    The supplied sequence is returned unchanged if none of the arguments
+    are wrapped objects, which is the common case for numeric arguments.
     """
-    return [a._swig_object if hasattr(a, "_swig_object") else a for a in args]
+    newargs = []
+    wrapped = False
+    for a in args:
+        swig_object = getattr(a, "_swig_object", _NOT_WRAPPED)
+        if swig_object is _NOT_WRAPPED:
+            newargs.append(a)
+        else:
+            newargs.append(swig_object)
+            wrapped = True
+    return newargs if wrapped else args
 
 
 def determine_dtype(options):
@@ -40,12 +55,7 @@ def determine_dtype(options):
     of that key and delete it from the dict. Returns a default value of
     np.float32.
     """
-    if "dtype" in options:
-        dtype = options["dtype"]
-        del options["dtype"]
-    else:
-        dtype = np.float32
-    return dtype
+    return options.pop("dtype", np.float32)
 
 
 def new_swig_object(dtype, lut, *args, **kwargs):
@@ -57,6 +67,44 @@ def new_swig_object(dtype, lut, *args, **kwargs):
     # Object translation
     args = swigify(args)
 
-    if dtype in lut:
-        return lut[dtype](*args, **kwargs)
-    raise ValueError("Unsupported data type for exposure")
+    constructor = lut.get(dtype)
+    if constructor is None:
+        raise ValueError("Unsupported data type for exposure")
+    return constructor(*args, **kwargs)
+
+
+class cached_property(object):
+    """
+    Property whose value is computed on first access and then stored in
+    the instance's "_cache" dict. Assigning through a setter declared with
+    cached_property.setter calls the setter and then the instance's
+    _invalidate() method so that all cached values are recomputed.
+
+    Similar to functools.cached_property but does not require a __dict__
+    and works on Python 2.
+    """
+
+    def __init__(self, fget, fset=None):
+        self.fget = fget
+        self.fset = fset
+        self.name = fget.__name__
+        self.__doc__ = fget.__doc__
+
+    def setter(self, fset):
+        return type(self)(self.fget, fset)
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        cache = obj._cache
+        try:
+            return cache[self.name]
+        except KeyError:
+            value = cache[self.name] = self.fget(obj)
+            return value
+
+    def __set__(self, obj, value):
+        if self.fset is None:
+            raise AttributeError("can't set attribute")
+        self.fset(obj, value)
+        obj._invalidate()
@@ -28,6 +28,7 @@ Experimental reimplementation of afwGeom.
 Work in progress. Documentation is not meant to be complete.
 
 """
+import numpy as np
 import lsst.afw.geom as afwGeom
 from . import _helper as h
 
@@ -38,6 +39,8 @@ class CoordinateExpr(object):
     expression.
     """
 
+    __slots__ = ("_swig_object", "_dimensions")
+
     def __init__(self, ndims, val=False, _external=None):
         """
         Initialise a CoordinateExpr object with N booleans
@@ -60,7 +63,21 @@ class CoordinateExpr(object):
             self._swig_object = afwGeom.CoordinateExpr3(val)
         else:
             raise ValueError("Unsupported dimensionality of {} requested".format(ndims))
-        return
+        # Dimensionality is fixed for the lifetime of the SWIG object
+        self._dimensions = len(self._swig_object)
+
+    @classmethod
+    def _wrap(cls, swig_object):
+        """
+        Create a CoordinateExpr around an existing SWIG object without
+        going through the constructor argument handling.
+
+        ce = CoordinateExpr._wrap(swig_object)
+        """
+        new = object.__new__(cls)
+        new._swig_object = swig_object
+        new._dimensions = len(swig_object)
+        return new
 
     @property
     def dimensions(self):
@@ -90,7 +107,7 @@ class CoordinateExpr(object):
 
         Raises AttributeError if this object has 2 dimensions.
         """
-        if self.dimensions == 3:
+        if self._dimensions == 3:
             return self[2]
         else:
             raise AttributeError("z attribute does not exist")
@@ -105,7 +122,7 @@ class CoordinateExpr(object):
 
     @z.setter
     def z(self, z):
-        if self.dimensions == 3:
+        if self._dimensions == 3:
             self[2] = z
         else:
             raise AttributeError("z attribute does not exist")
@@ -115,7 +132,7 @@ class CoordinateExpr(object):
         Convert the swig object integer list into a tuple
         of booleans.
         """
-        return tuple(bool(v) for v in self._swig_object)
+        return tuple([bool(v) for v in self._swig_object])
 
     def all_true(self):
         """
@@ -124,7 +141,7 @@ class CoordinateExpr(object):
 
         combo = cexp.all_true()
         """
-        return reduce(lambda x, y: x and y, self._as_tuple())
+        return all(self._swig_object)
 
     def __str__(self):
         """
@@ -137,7 +154,7 @@ class CoordinateExpr(object):
         """
         Dimensionality of the object.
         """
-        return len(self._swig_object)
+        return self._dimensions
 
     def __setitem__(self, k, v):
         """
@@ -162,28 +179,27 @@ class CoordinateExpr(object):
         This object can support the ~ operator.
         """
         new = self._swig_object.not_()
-        return self.__class__(0, _external=new)
+        return self._wrap(new)
 
     def __and__(self, rhs):
         """
         This object can support the & operator.
         """
         new = self._swig_object.and_(rhs._swig_object)
-        return self.__class__(0, _external=new)
+        return self._wrap(new)
 
     def __or__(self, rhs):
         """
         This object can support the | operator.
         """
         new = self._swig_object.or_(rhs._swig_object)
-        return self.__class__(0, _external=new)
+        return self._wrap(new)
 
     def __deepcopy__(self, memo):
         """
         This object can be deep copied using copy.deepcopy().
         """
-        copy = type(self)(0, self._swig_object.clone())
-        return copy
+        return self._wrap(self._swig_object.clone())
 
 
 class PointExtent(object):
@@ -245,41 +261,31 @@ class PointExtent(object):
 
         Raises ValueError if other types are found.
         """
-        # Assume int, use double if any double present
-        dtype = "I"
+        # Assume int, use double if any double present. Compare the types
+        # directly rather than their names as this is called for every
+        # generic Point/Extent construction.
         for i in args:
-            t = type(i).__name__
-            if t == "int":
-                pass
-            elif t == "float":
-                dtype = "D"
-                break
-            else:
-                raise ValueError("Unsupported type found {}".format(t))
-        return dtype
+            t = type(i)
+            if t is int:
+                continue
+            if t is float:
+                return "D"
+            raise ValueError("Unsupported type found {}".format(t.__name__))
+        return "I"
 
     @classmethod
-    def _determine_class(cls, ndims, dtype, class2I, class2D, class3I, class3D):
+    def _determine_class(cls, ndims, dtype, classes):
         """
-        Converts a dimensinality and data type into a python class from one of the
-        four supplied.
+        Converts a dimensinality and data type into a python class using
+        the supplied (ndims, dtype) lookup table.
 
-        class = cls._determine_class(2, "D", Extent2I, Extent2D, Extent3I, Extent3D)
+        class = cls._determine_class(2, "D", _EXTENT_CLASSES)
 
         Raises ValueError if the dimensionality and data type are not recognized.
         """
-        newclass = None
-        if ndims == 2 and dtype == "I":
-            newclass = class2I
-        elif ndims == 2 and dtype == "D":
-            newclass = class2D
-        elif ndims == 3 and dtype == "I":
-            newclass = class3I
-        elif ndims == 3 and dtype == "D":
-            newclass = class3D
-        else:
+        newclass = classes.get((ndims, dtype))
+        if newclass is None:
             raise ValueError("Can not determine constructor class from inferred dimensionality or data type")
-        # print("{}{} -> {}".format(ndims, dtype, newclass))
         return newclass
 
     @classmethod
@@ -290,21 +296,10 @@ class PointExtent(object):
 
         obj = cls._from_swig_object(swig_object)
         """
-        # Bit of a hack
-        name = type(swig_object).__name__
-        lut = {
-            "Extent2D": Extent2D,
-            "Extent2I": Extent2I,
-            "Point2D": Point2D,
-            "Point2I": Point2I,
-            "Extent3D": Extent3D,
-            "Extent3I": Extent3I,
-            "Point3D": Point3D,
-            "Point3I": Point3I
-            }
-        if name in lut:
-            return lut[name](_external=swig_object)
-        raise ValueError("Unrecognized object type {} from {}".format(type(swig_object), swig_object))
+        newclass = _SWIG_TO_PYTHON.get(type(swig_object))
+        if newclass is None:
+            raise ValueError("Unrecognized object type {} from {}".format(type(swig_object), swig_object))
+        return newclass._wrap(swig_object)
 
 
 class Point(PointExtent):
@@ -332,13 +327,12 @@ class Point(PointExtent):
         """
         # Have to determine which of 2I, 2D, 3D or 3I objects is required
         ndims, dtype, args = cls._determine_typedims(*args, **kwargs)
-        newclass = cls._determine_class(ndims, dtype, Point2I, Point2D, Point3I, Point3D)
+        newclass = cls._determine_class(ndims, dtype, _POINT_CLASSES)
 
-        # Since we are returning an object that is of a different
-        # class then we must explicitly call __init__
-        newone = object.__new__(newclass)
-        newone.__init__(*args)
-        return newone
+        # The concrete classes do not derive from this class, so Python will
+        # not call __init__ on the result for us; construct it directly so
+        # that __init__ runs exactly once.
+        return newclass(*args)
 
     @classmethod
     def _check_firstarg(cls, arg0):
@@ -352,6 +346,8 @@ class Point(PointExtent):
 class ExtentPointBase(object):
     # These are all mutable objects
     __hash__ = None
+    # Subclasses only hold the SWIG object
+    __slots__ = ("_swig_object",)
 
     def __init__(self, constructor, *args, **kwargs):
         """
@@ -369,10 +365,22 @@ class ExtentPointBase(object):
         if len(args) == 1 and isinstance(args[0], (list, tuple)):
             args = args[0]
         # Convert args to C++ objects
-        newargs = h.swigify(args)
+        args = h.swigify(args)
 
         # Call the C++ constructor
-        self._swig_object = constructor(*newargs)
+        self._swig_object = constructor(*args)
+
+    @classmethod
+    def _wrap(cls, swig_object):
+        """
+        Create an object around an existing SWIG object without going
+        through the constructor argument handling.
+
+        obj = cls._wrap(swig_object)
+        """
+        new = object.__new__(cls)
+        new._swig_object = swig_object
+        return new
 
     @property
     def dimensions(self):
@@ -400,12 +408,10 @@ class ExtentPointBase(object):
         """
         z coordinate if the dimensionality is 3.
 
-        Raises AttributeError if this is a 2d object.
+        Raises AttributeError if this is a 2d object. The 3d classes
+        replace this property with _Z_PROPERTY.
         """
-        if self.dimensions == 3:
-            return self._swig_object.getZ()
-        else:
-            raise AttributeError("z attribute does not exist")
+        raise AttributeError("z attribute does not exist")
 
     @x.setter
     def x(self, x):
@@ -413,14 +419,11 @@ class ExtentPointBase(object):
 
     @y.setter
     def y(self, y):
-        self._swig_object.setX(y)
+        self._swig_object.setY(y)
 
     @z.setter
     def z(self, z):
-        if self.dimensions == 3:
-            return self._swig_object.setZ(z)
-        else:
-            raise AttributeError("z attribute does not exist")
+        raise AttributeError("z attribute does not exist")
 
     def swap(self, other):
         """
@@ -436,7 +439,7 @@ class ExtentPointBase(object):
         coordinates in the primary object are greater than or equal to the corresponding
         coordinates in the supplied object.
         """
-        return CoordinateExpr(0, _external=self._swig_object.ge(other._swig_object))
+        return CoordinateExpr._wrap(self._swig_object.ge(other._swig_object))
 
     def gt(self, other):
         """
@@ -444,7 +447,7 @@ class ExtentPointBase(object):
         coordinates in the primary object are greater than the corresponding
         coordinates in the supplied object.
         """
-        return CoordinateExpr(0, _external=self._swig_object.gt(other._swig_object))
+        return CoordinateExpr._wrap(self._swig_object.gt(other._swig_object))
 
     def le(self, other):
         """
@@ -452,7 +455,7 @@ class ExtentPointBase(object):
         coordinates in the primary object are less than or equal to the corresponding
         coordinates in the supplied object.
         """
-        return CoordinateExpr(0, _external=self._swig_object.le(other._swig_object))
+        return CoordinateExpr._wrap(self._swig_object.le(other._swig_object))
 
     def lt(self, other):
         """
@@ -460,16 +463,13 @@ class ExtentPointBase(object):
         coordinates in the primary object are less than the corresponding
         coordinates in the supplied object.
         """
-        return CoordinateExpr(0, _external=self._swig_object.lt(other._swig_object))
+        return CoordinateExpr._wrap(self._swig_object.lt(other._swig_object))
 
     def __deepcopy__(self, memo):
         """
         Implement copy.deepcopy() support.
         """
-        # Construct an empty object that we can fill explicitly
-        copy = type(self)()
-        copy._swig_object = self._swig_object.clone()
-        return copy
+        return self._wrap(self._swig_object.clone())
 
     def __str__(self):
         """
@@ -498,37 +498,60 @@ class ExtentPointBase(object):
         """
         return self._swig_object != other._swig_object
 
+    def _check_comparable(self, other):
+        """
+        Raise TypeError unless other can be compared coordinate by
+        coordinate with this object (same Point/Extent kind, dimensionality
+        and data type).
+        """
+        if type(other) is not type(self):
+            raise TypeError("Can not compare {} with {}".format(type(self).__name__,
+                                                                type(other).__name__))
+
     def __lt__(self, other):
         """
         Returns true if all coordinates are less than those
-        in the supplied object.
+        in the supplied object. Compares coordinates directly rather than
+        building a CoordinateExpr so that the first failure short-circuits.
         """
-        ce = self.lt(other)
-        return ce.all_true()
+        self._check_comparable(other)
+        s = self._swig_object
+        o = other._swig_object
+        return (s.getX() < o.getX() and s.getY() < o.getY() and
+                (self._dimensions == 2 or s.getZ() < o.getZ()))
 
     def __gt__(self, other):
         """
         Returns true if all coordinates are greater than those
         in the supplied object.
         """
-        ce = self.gt(other)
-        return ce.all_true()
+        self._check_comparable(other)
+        s = self._swig_object
+        o = other._swig_object
+        return (s.getX() > o.getX() and s.getY() > o.getY() and
+                (self._dimensions == 2 or s.getZ() > o.getZ()))
 
     def __le__(self, other):
         """
         Returns true if all coordinates are less than or equal to those
         in the supplied object.
         """
-        ce = self.le(other)
-        return ce.all_true()
+        self._check_comparable(other)
+        s = self._swig_object
+        o = other._swig_object
+        return (s.getX() <= o.getX() and s.getY() <= o.getY() and
+                (self._dimensions == 2 or s.getZ() <= o.getZ()))
 
     def __ge__(self, other):
         """
         Returns true if all coordinates are greater than or equal to those
         in the supplied object.
         """
-        ce = self.ge(other)
-        return ce.all_true()
+        self._check_comparable(other)
+        s = self._swig_object
+        o = other._swig_object
+        return (s.getX() >= o.getX() and s.getY() >= o.getY() and
+                (self._dimensions == 2 or s.getZ() >= o.getZ()))
 
     def __iadd__(self, other):
         """
@@ -543,7 +566,7 @@ class ExtentPointBase(object):
         Add an Extent to an Extent and return a new Extent.
         """
         new = self._swig_object + other._swig_object
-        return self.__class__(_external=new)
+        return self._wrap(new)
 
     def __isub__(self, other):
         """
@@ -558,16 +581,13 @@ class ExtentPointBase(object):
         """
         new = self._swig_object - other._swig_object
         # Return can be Extent or Point depending on type of other
-        cls = Point
-        if "Extent" in new.__class__.__name__:
-            cls = Extent
-        return cls._from_swig_object(new)
+        return _SWIG_TO_PYTHON[type(new)]._wrap(new)
 
     def __len__(self):
         """
         Return the length/dimensionality of the object.
         """
-        return len(self._swig_object)
+        return self._dimensions
 
     def __getitem__(self, k):
         """
@@ -582,8 +602,23 @@ class ExtentPointBase(object):
         self._swig_object[k] = v
 
 
+def _get_z(self):
+    return self._swig_object.getZ()
+
+
+def _set_z(self, z):
+    self._swig_object.setZ(z)
+
+
+# z accessor for the 3d Point and Extent classes, avoiding a runtime
+# dimensionality check on every access
+_Z_PROPERTY = property(_get_z, _set_z, doc="z coordinate.")
+
+
 class PointBase(ExtentPointBase):
 
+    __slots__ = ()
+
     def distance_squared(self, other):
         """
         Return the distance squared between two points.
@@ -626,6 +661,10 @@ class Point3(Point):
 
 class Point2D(PointBase):
 
+    _dimensions = 2
+    _dtype = "D"
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         """
         Initialize a Point2D object.
@@ -635,13 +674,15 @@ class Point2D(PointBase):
         Keyword argument "_external" can be used to supply an explicit SWIG
         object.
         """
-        self._dimensions = 2
-        self._dtype = "D"
         super(Point2D, self).__init__(afwGeom.Point2D, *args, **kwargs)
 
 
 class Point2I(PointBase):
 
+    _dimensions = 2
+    _dtype = "I"
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         """
         Initialize a Point2I object.
@@ -651,13 +692,16 @@ class Point2I(PointBase):
         Keyword argument "_external" can be used to supply an explicit SWIG
         object.
         """
-        self._dimensions = 2
-        self._dtype = "I"
         super(Point2I, self).__init__(afwGeom.Point2I, *args, **kwargs)
 
 
 class Point3D(PointBase):
 
+    _dimensions = 3
+    _dtype = "D"
+    __slots__ = ()
+    z = _Z_PROPERTY
+
     def __init__(self, *args, **kwargs):
         """
         Initialize a Point3D object.
@@ -667,13 +711,16 @@ class Point3D(PointBase):
         Keyword argument "_external" can be used to supply an explicit SWIG
         object.
         """
-        self._dimensions = 3
-        self._dtype = "D"
         super(Point3D, self).__init__(afwGeom.Point3D, *args, **kwargs)
 
 
 class Point3I(PointBase):
 
+    _dimensions = 3
+    _dtype = "I"
+    __slots__ = ()
+    z = _Z_PROPERTY
+
     def __init__(self, *args, **kwargs):
         """
         Initialize a Point3I object.
@@ -683,8 +730,6 @@ class Point3I(PointBase):
         Keyword argument "_external" can be used to supply an explicit SWIG
         object.
         """
-        self._dimensions = 3
-        self._dtype = "I"
         super(Point3I, self).__init__(afwGeom.Point3I, *args, **kwargs)
 
 
@@ -728,14 +773,12 @@ class Extent(PointExtent):
         # print("CLASS IS {}".format(cls))
         # Have to determine which of 2I, 2D, 3D or 3I objects is required
         ndims, dtype, args = cls._determine_typedims(*args, **kwargs)
-        newclass = cls._determine_class(ndims, dtype, Extent2I, Extent2D,
-                                        Extent3I, Extent3D)
+        newclass = cls._determine_class(ndims, dtype, _EXTENT_CLASSES)
 
-        # Since we are returning an object that is of a different
-        # class then we must explicitly call __init__
-        newone = object.__new__(newclass)
-        newone.__init__(*args)
-        return newone
+        # The concrete classes do not derive from this class, so Python will
+        # not call __init__ on the result for us; construct it directly so
+        # that __init__ runs exactly once.
+        return newclass(*args)
 
 
 class Extent2(Extent):
@@ -755,18 +798,25 @@ class Extent3(Extent):
 
 
 class ExtentBase(ExtentPointBase):
+
+    __slots__ = ()
+
     def compute_squared_norm(self):
         return self._swig_object.computeSquaredNorm()
 
 
 class ExtentI(ExtentBase):
 
+    __slots__ = ()
+
     def compute_norm(self):
         raise TypeError("Cannot compute norm of integer extent")
 
 
 class ExtentD(ExtentBase):
 
+    __slots__ = ()
+
     def compute_norm(self):
         return self._swig_object.computeNorm()
 
@@ -776,39 +826,148 @@ class ExtentD(ExtentBase):
 
 class Extent2D(ExtentD):
 
+    _dimensions = 2
+    _dtype = "D"
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
-        self._dimensions = 2
-        self._dtype = "D"
         super(Extent2D, self).__init__(afwGeom.Extent2D, *args, **kwargs)
 
 
 class Extent2I(ExtentI):
 
+    _dimensions = 2
+    _dtype = "I"
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
-        self._dimensions = 2
-        self._dtype = "I"
         super(Extent2I, self).__init__(afwGeom.Extent2I, *args, **kwargs)
 
 
 class Extent3D(ExtentD):
 
+    _dimensions = 3
+    _dtype = "D"
+    __slots__ = ()
+    z = _Z_PROPERTY
+
     def __init__(self, *args, **kwargs):
-        self._dimensions = 3
-        self._dtype = "D"
         super(Extent3D, self).__init__(afwGeom.Extent3D, *args, **kwargs)
 
 
 class Extent3I(ExtentI):
 
+    _dimensions = 3
+    _dtype = "I"
+    __slots__ = ()
+    z = _Z_PROPERTY
+
     def __init__(self, *args, **kwargs):
-        self._dimensions = 3
-        self._dtype = "I"
         super(Extent3I, self).__init__(afwGeom.Extent3I, *args, **kwargs)
 
 
+# Python wrapper class to use for each SWIG Point and Extent class
+_SWIG_TO_PYTHON = {
+    afwGeom.Extent2D: Extent2D,
+    afwGeom.Extent2I: Extent2I,
+    afwGeom.Point2D: Point2D,
+    afwGeom.Point2I: Point2I,
+    afwGeom.Extent3D: Extent3D,
+    afwGeom.Extent3I: Extent3I,
+    afwGeom.Point3D: Point3D,
+    afwGeom.Point3I: Point3I,
+    }
+
+# Concrete classes returned by the generic Point and Extent constructors
+# keyed by (dimensionality, data type)
+_POINT_CLASSES = {
+    (2, "I"): Point2I,
+    (2, "D"): Point2D,
+    (3, "I"): Point3I,
+    (3, "D"): Point3D,
+    }
+
+_EXTENT_CLASSES = {
+    (2, "I"): Extent2I,
+    (2, "D"): Extent2D,
+    (3, "I"): Extent3I,
+    (3, "D"): Extent3D,
+    }
+
+
+# Numpy equivalents of the coordinate comparison methods
+_COMPARE_UFUNCS = {
+    "lt": np.less,
+    "gt": np.greater,
+    "le": np.less_equal,
+    "ge": np.greater_equal,
+    }
+
+
+def to_ndarray(points):
+    """
+    Copy the coordinates of a sequence of Point or Extent objects into
+    a numpy array of shape (N, dimensions). All the objects must have
+    the same type as the first one.
+
+    array = to_ndarray([Point2I(1, 2), Point2I(3, 4)])
+    """
+    if len(points) == 0:
+        raise ValueError("Can not determine dimensionality of an empty sequence")
+    first = points[0]
+    cls = type(first)
+    for p in points:
+        if type(p) is not cls:
+            msg = "All objects must be of type {}, found {}".format(cls.__name__, type(p).__name__)
+            raise ValueError(msg)
+    dtype = np.float64 if first._dtype == "D" else np.int32
+    array = np.empty((len(points), first.dimensions), dtype=dtype)
+    if first.dimensions == 3:
+        for i, p in enumerate(points):
+            so = p._swig_object
+            array[i] = (so.getX(), so.getY(), so.getZ())
+    else:
+        for i, p in enumerate(points):
+            so = p._swig_object
+            array[i] = (so.getX(), so.getY())
+    return array
+
+
+def compare_all(points_a, points_b, op):
+    """
+    Compare two sequences of Point or Extent objects element by element
+    using one of "lt", "gt", "le" or "ge" and return a numpy boolean
+    array indicating where all the coordinates met the comparison.
+    points_b can also be a single object, or a sequence of length one, to
+    compare every element against.
+
+    Equivalent to [a < b for a, b in zip(points_a, points_b)] for sequences
+    of equal length, and raises TypeError for objects of different types
+    as the comparison operators do. Unlike zip(), sequences of different
+    lengths raise ValueError. The comparison itself is done by numpy.
+    Prefer this for bulk comparisons.
+
+    inside = compare_all(points, Point2I(100, 100), "lt")
+    """
+    ufunc = _COMPARE_UFUNCS.get(op)
+    if ufunc is None:
+        raise ValueError("Unsupported comparison operator {}".format(op))
+    if isinstance(points_b, ExtentPointBase):
+        points_b = (points_b,)
+    if len(points_b) != 1 and len(points_b) != len(points_a):
+        msg = "Can not compare sequences of length {} and {}".format(len(points_a), len(points_b))
+        raise ValueError(msg)
+    array_a = to_ndarray(points_a)
+    array_b = to_ndarray(points_b)
+    points_a[0]._check_comparable(points_b[0])
+    return np.all(ufunc(array_a, array_b), axis=1)
+
+
 class BoxBase(object):
     # These are all mutable objects
     __hash__ = None
+    # Subclasses only hold the SWIG object
+    __slots__ = ("_swig_object",)
 
     def __init__(self, constructor, *args, **kwargs):
         # if we are being given a swig object directly we use it
@@ -822,6 +981,18 @@ class BoxBase(object):
         # Call the C++ constructor
         self._swig_object = constructor(*newargs)
 
+    @classmethod
+    def _wrap(cls, swig_object):
+        """
+        Create an object around an existing SWIG object without going
+        through the constructor argument handling.
+
+        obj = cls._wrap(swig_object)
+        """
+        new = object.__new__(cls)
+        new._swig_object = swig_object
+        return new
+
     @property
     def area(self):
         return self._swig_object.getArea()
@@ -842,7 +1013,8 @@ class BoxBase(object):
     @property
     def corners(self):
         vec = self._swig_object.getCorners()
-        return tuple([Point._from_swig_object(v) for v in vec])
+        wrap = Point._from_swig_object
+        return tuple([wrap(v) for v in vec])
 
     @property
     def dimensions(self):
@@ -929,13 +1101,17 @@ class BoxBase(object):
 
 class Box2D(BoxBase):
 
+    _dtype = "D"
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
-        self._dtype = "I"
         super(Box2D, self).__init__(afwGeom.Box2D, *args, **kwargs)
 
 
 class Box2I(BoxBase):
 
+    _dtype = "I"
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
-        self._dtype = "I"
         super(Box2I, self).__init__(afwGeom.Box2I, *args, **kwargs)
@@ -29,14 +29,32 @@ Work in progress. Documentation is not meant to be complete.
 
 """
 import numpy as np
-import lsst.afw.image as afwImage
 from . import geom
 from . import _helper as h
-from copy import deepcopy
+
+# lsst.afw.image is large so is only imported when first needed,
+# see _afw_image()
+afwImage = None
+
+
+def _afw_image():
+    """
+    Return the lsst.afw.image module, importing it on first use.
+    """
+    global afwImage
+    if afwImage is None:
+        import lsst.afw.image as afwImage
+    return afwImage
 
 
 class Exposure (object):
 
+    __slots__ = ("_swig_object", "_cache")
+
+    # Map of numpy data type to the afw class to construct, filled on
+    # first use by _swig_types()
+    _SWIG_TYPES = None
+
     def __init__(self, *args, **kwargs):
         """
         Constructor for an exposure. Currently forwards on arguments to corresponding afw ExposureX
@@ -75,6 +93,9 @@ class Exposure (object):
         exposure = afwExperiment.Exposure( Extent(100, 100) )
         exposure = afwExperiment.Exposure( dtype=float32 )
         """
+        # Values read from the SWIG object, see _invalidate()
+        self._cache = {}
+
         # Check to see if this is an empty object
         if "empty" in kwargs and kwargs["empty"]:
             return
@@ -88,22 +109,38 @@ class Exposure (object):
         dtype = h.determine_dtype(kwargs)
         self._swig_object = self._create_ExposureX(dtype, *args, **kwargs)
 
+    def _invalidate(self):
+        """
+        Discard values cached from the SWIG object. Must be called whenever
+        the SWIG object is replaced or modified through this wrapper.
+        """
+        self._cache = {}
+
+    @classmethod
+    def _swig_types(cls):
+        if cls._SWIG_TYPES is None:
+            afw = _afw_image()
+            cls._SWIG_TYPES = {
+                np.float32: afw.ExposureF,
+                np.float64: afw.ExposureD,
+                np.int32: afw.ExposureI,
+                }
+        return cls._SWIG_TYPES
+
     @classmethod
     def _create_ExposureX(cls, dtype, *args, **kwargs):
-        lut = {
-            np.float32: afwImage.ExposureF,
-            np.float64: afwImage.ExposureD,
-            np.int32: afwImage.ExposureI,
-            }
-        return h.new_swig_object(dtype, lut, *args, **kwargs)
+        return h.new_swig_object(dtype, cls._swig_types(), *args, **kwargs)
 
     @property
     def bbox(self):
         # Note that getBBox() has a form that takes an ImageOrigin argument
         # but that can not be a property. See get_bbox_with_origin()
         bb = self._swig_object.getBBox()
-        return geom.Box2I(_external=bb)
+        return geom.Box2I._wrap(bb)
 
+    # Values held by the shared ExposureInfo (calib, detector, filter, info,
+    # metadata, psf, wcs) are not cached as they can be changed behind this
+    # wrapper, e.g. through info.setWcs()
     @property
     def calib(self):
         return self._swig_object.getCalib()
@@ -116,7 +153,7 @@ class Exposure (object):
     def filter(self):
         return self._swig_object.getFilter()
 
-    @property
+    @h.cached_property
     def height(self):
         return self._swig_object.getHeight()
 
@@ -126,6 +163,8 @@ class Exposure (object):
 
     @property
     def masked_image(self):
+        # Not cached so that release() on a returned wrapper does not
+        # affect later reads
         return MaskedImage(_external=self._swig_object.getMaskedImage())
 
     @property
@@ -140,20 +179,20 @@ class Exposure (object):
     def wcs(self):
         return self._swig_object.getWcs()
 
-    @property
+    @h.cached_property
     def width(self):
         return self._swig_object.getWidth()
 
-    @property
+    @h.cached_property
     def x0(self):
         return self._swig_object.getX0()
 
     @property
     def xy0(self):
         p = self._swig_object.getXY0()
-        return geom.Point2I(_external=p)
+        return geom.Point2I._wrap(p)
 
-    @property
+    @h.cached_property
     def y0(self):
         return self._swig_object.getY0()
 
@@ -172,6 +211,7 @@ class Exposure (object):
     @masked_image.setter
     def masked_image(self, maskedImage):
         self._swig_object.setMaskedImage(maskedImage._swig_object)
+        self._invalidate()
 
     @metadata.setter
     def metadata(self, metadata):
@@ -188,10 +228,11 @@ class Exposure (object):
     @xy0.setter
     def xy0(self, origin):
         self._swig_object.setXY0(origin._swig_object)
+        self._invalidate()
 
     def get_bbox_with_origin(self, origin):
         bb = self._swig_object.getBBox(origin._swig_object)
-        return geom.Box2I(_external=bb)
+        return geom.Box2I._wrap(bb)
 
     def has_psf(self):
         return self._swig_object.hasPsf()
@@ -203,21 +244,37 @@ class Exposure (object):
         self._swig_object.writeFits(*args)
 
     def __deepcopy__(self, memo):
-        # Construct an empty object that we can fill explicitly
-        copy = type(self)(empty=True)
-        copy._swig_object = self._swig_object.clone()
-        return copy
+        return type(self)(_external=self._swig_object.clone())
 
     @classmethod
     def read_fits(cls, *args, **kwargs):
         dtype = h.determine_dtype(kwargs)
         new = cls(empty=True)
         new._swig_object = cls._create_ExposureX(dtype, *args)
+        new._invalidate()
         return new
 
+    @classmethod
+    def read_fits_batch(cls, filenames, *args, **kwargs):
+        """
+        Read each of the supplied FITS files into an Exposure, returning
+        them as a list. Any further arguments are passed to every read as
+        for read_fits().
+
+        exposures = Exposure.read_fits_batch(filenames, dtype=np.float64)
+        """
+        dtype = h.determine_dtype(kwargs)
+        constructor = cls._swig_types().get(dtype)
+        if constructor is None:
+            raise ValueError("Unsupported data type for exposure")
+        args = h.swigify(args)
+        return [cls(_external=constructor(f, *args)) for f in filenames]
+
 
 class Image(object):
 
+    __slots__ = ("_swig_object",)
+
     def __init__(self, *args, **kwargs):
         if "_external" in kwargs and kwargs["_external"] is not None:
             self._swig_object = kwargs["_external"]
@@ -235,56 +292,113 @@ class Image(object):
 
 class MaskedImage(object):
 
+    __slots__ = ("_swig_object", "_cache")
+
+    # Map of numpy data type to the afw class to construct, filled on
+    # first use by _swig_types()
+    _SWIG_TYPES = None
+
     def __init__(self, *args, **kwargs):
+        # Values read from the SWIG object, see _invalidate()
+        self._cache = {}
+
         if "_external" in kwargs and kwargs["_external"] is not None:
             self._swig_object = kwargs["_external"]
             return
         dtype = h.determine_dtype(kwargs)
         self._swig_object = self._create_MaskedImageX(dtype, *args, **kwargs)
 
+    def _invalidate(self):
+        """
+        Discard values cached from the SWIG object. Must be called whenever
+        the SWIG object is replaced.
+        """
+        self._cache = {}
+
+    @classmethod
+    def _swig_types(cls):
+        if cls._SWIG_TYPES is None:
+            afw = _afw_image()
+            cls._SWIG_TYPES = {
+                np.float32: afw.MaskedImageF,
+                np.float64: afw.MaskedImageD,
+                np.int32: afw.MaskedImageI,
+                np.uint32: afw.MaskedImageU,
+                }
+        return cls._SWIG_TYPES
+
     @classmethod
     def _create_MaskedImageX(cls, dtype, *args, **kwargs):
-        lut = {
-            np.float32: afwImage.MaskedImageF,
-            np.float64: afwImage.MaskedImageD,
-            np.int32: afwImage.MaskedImageI,
-            np.uint32: afwImage.MaskedImageU,
-            }
-        return h.new_swig_object(dtype, lut, *args, **kwargs)
+        return h.new_swig_object(dtype, cls._swig_types(), *args, **kwargs)
 
     def __getitem__(self, slice):
         """
         Support slicing of a MaskedImage. Returns the slice of each numpy array
         as a tuple.
         """
-        arrays = self._swig_object.getArrays()
-        return (a[slice] for a in arrays)
+        arrays = self.arrays
+        return (arrays[0][slice], arrays[1][slice], arrays[2][slice])
 
     def __setitem__(self, slice, values):
         """
         Given a tuple of replacement values (data, variance, mask) assign them to
         the sliced MaskedImage arrays.
         """
-        arrays = self._swig_object.getArrays()
-        for a, v in zip(arrays, values):
-            a[slice] = v
+        arrays = self.arrays
+        arrays[0][slice] = values[0]
+        arrays[1][slice] = values[1]
+        arrays[2][slice] = values[2]
 
-    @property
+    @h.cached_property
     def arrays(self):
         """
         Numpy arrays for image, mask and variance, returned as tuple.
+        The arrays are views of the pixel data so are cached.
         """
         return self._swig_object.getArrays()
 
-    @property
+    def map_inplace(self, kernel, *args):
+        """
+        Call kernel(image, mask, variance, *args) with the pixel arrays of
+        this MaskedImage, returning the result of the kernel.
+
+        The arrays are views so the kernel can update all three planes in a
+        single pass over the pixels. A compiled kernel, for example one
+        decorated with numba.njit, avoids the separate passes that
+        equivalent numpy expressions would make.
+
+        mi.map_inplace(clip_kernel, threshold)
+        """
+        image, mask, variance = self.arrays
+        return kernel(image, mask, variance, *args)
+
+    def packed(self):
+        """
+        Interleaved copy of the image, mask and variance as a single
+        structured array with fields "image", "mask" and "variance".
+
+        Useful for kernels that read all three planes at each pixel as the
+        values for a pixel are then contiguous in memory. Changes to the
+        returned array are not reflected in the MaskedImage.
+        """
+        image, mask, variance = self.arrays
+        packed = np.empty(image.shape, dtype=[("image", image.dtype),
+                                              ("mask", mask.dtype),
+                                              ("variance", variance.dtype)])
+        packed["image"] = image
+        packed["mask"] = mask
+        packed["variance"] = variance
+        return packed
+
+    @h.cached_property
     def image(self):
         return Image(_external=self._swig_object.getImage(noThrow=True))
 
-    @property
+    @h.cached_property
     def mask(self):
         return Image(_external=self._swig_object.getMask(noThrow=True))
 
-    @property
+    @h.cached_property
     def variance(self):
         return Image(_external=self._swig_object.getVariance(noThrow=True))
 
@@ -293,28 +407,66 @@ class MaskedImage(object):
         # Note that getBBox() has a form that takes an ImageOrigin argument
         # but that can not be a property. See get_bbox_with_origin()
         bb = self._swig_object.getBBox()
-        return geom.Box2I(_external=bb)
+        return geom.Box2I._wrap(bb)
 
     @property
     def dimensions(self):
         e = self._swig_object.getDimensions()
-        return geom.Extent2I(_external=e)
+        return geom.Extent2I._wrap(e)
 
     def get_bbox_with_origin(self, origin):
         bb = self._swig_object.getBBox(origin._swig_object)
-        return geom.Box2I(_external=bb)
+        return geom.Box2I._wrap(bb)
+
+    def release(self):
+        """
+        Drop the references this object holds to the underlying pixel
+        data, including the cached arrays, so that the memory can be freed
+        without waiting for this object to be garbage collected. The
+        memory is only freed once any arrays previously returned from this
+        object have also been released. The MaskedImage can not be used
+        after this call.
+        """
+        self._swig_object = None
+        self._invalidate()
 
     def __deepcopy__(self, memo):
-        # Construct an empty object that we can fill explicitly
-        copy = type(self)(empty=True)
-        copy._swig_object = self._swig_object.clone()
-        return copy
+        return type(self)(_external=self._swig_object.clone())
+
+
+# Name of the method used to copy values of each type held by an
+# ExposureInfo, or None if values are shared. See _copy_method().
+_COPY_METHODS = {}
+
+
+def _copy_method(value_type):
+    """
+    Return "clone" or "deepCopy" depending on which copy method the
+    supplied type implements, or None if it has neither. The answer is
+    cached per type so the attribute probes are done only once.
+    """
+    try:
+        return _COPY_METHODS[value_type]
+    except KeyError:
+        pass
+    if hasattr(value_type, "clone"):
+        method = "clone"
+    elif hasattr(value_type, "deepCopy"):
+        method = "deepCopy"
+    else:
+        method = None
+    _COPY_METHODS[value_type] = method
+    return method
 
 
 class ExposureInfo(object):
     """
     Information about an Exposure
     """
+
+    __slots__ = ("wcs", "psf", "detector", "calib", "metadata", "filter",
+                 "coadd_inputs")
+
     def __init__(self, wcs=None, psf=None, calib=None, filter=None,
                  detector=None, metadata=None, coadd_inputs=None,
                  info=None, copy_metadata=False,):
@@ -363,7 +515,8 @@ class ExposureInfo(object):
             self.coadd_inputs = coadd_inputs
         else:
             # Copy info. These are usually SWIGged objects
-            for attr, value in info.__dict__.items():
+            for attr in self.__slots__:
+                value = getattr(info, attr)
                 if value is not None:
                     # Only clone if clone is implemented, else copy reference.
                     # Some objects are immutable so no need to clone
@@ -371,15 +524,17 @@ class ExposureInfo(object):
                     # but that interface is not exposed to Python.
                     # lsst.daf.base.PropertySet has deepCopy() rather than clone()
                     # and we may not always want to deep copy that.
-                    if hasattr(value, "clone"):
-                        value = value.clone()
-                    elif hasattr(value, "deepCopy"):
+                    method = _copy_method(type(value))
+                    if method == "deepCopy" and attr == "metadata" and not copy_metadata:
                         # Deep copy unless this is metadata and we have been told not to
-                        if attr == "metadata" and not copy_metadata:
-                            pass
-                        else:
-                            value = value.deepCopy()
-                    self.__dict__[attr] = value
+                        method = None
+                    if method is not None:
+                        value = getattr(value, method)()
+                    setattr(self, attr, value)
+
+    def __deepcopy__(self, memo):
+        # The copy constructor clones each member that supports it
+        return type(self)(info=self, copy_metadata=True)
 
     def has_calib(self):
         """
@@ -454,14 +609,12 @@ class ExposurePy(object):
         if len(args) == 0:
             return
 
-        deep = False
-        if deep in kwargs:
-            deep = kwargs["deep"]
+        deep = kwargs.get("deep", False)
 
-        if isinstance(args[0], "ExposurePy"):
+        if isinstance(args[0], ExposurePy):
             mi = args[0].masked_image
             if deep:
-                mi = deepcopy(mi)
+                mi = MaskedImage(_external=mi._swig_object.clone())
             self.masked_image = mi
         else:
             self.masked_image = MaskedImage(*args)
@@ -475,5 +628,16 @@ def make_exposure(*args):
     """
     # Convert the argument list to swig arguments as required
     newargs = h.swigify(args)
-    _swig_object = afwImage.makeExposure(*newargs)
+    _swig_object = _afw_image().makeExposure(*newargs)
     return Exposure(_external=_swig_object)
+
+
+def make_exposures(masked_images):
+    """
+    Create an Exposure from each of the supplied MaskedImage objects,
+    returning them as a list.
+
+    exposures = make_exposures([mi1, mi2])
+    """
+    make = _afw_image().makeExposure
+    return [Exposure(_external=make(mi)) for mi in h.swigify(tuple(masked_images))]
@@ -22,27 +22,69 @@
 # see <http://www.lsstcorp.org/LegalNotices/>.
 #
 
-from __future__ import print_function, absolute_import, division
 import unittest
+from itertools import repeat
 
 #from lsst.daf.base import DateTime
 from lsstx.DateTime import DateTime
 import lsstx.DateTime
+import numpy as np
 import os
 import time
 
+try:
+    _time_ns = time.time_ns
+except AttributeError:
+    def _time_ns():
+        return int(time.time() * 1e9)
+
+_UTC, _TAI, _TT, _MJD = DateTime.UTC, DateTime.TAI, DateTime.TT, DateTime.MJD
+
+# The same instant as UTC and TAI nanoseconds, shared by the nsecs tests
+_NS_UTC = 1192755473_000_000_000
+_NS_TAI = 1192755506_000_000_000
+
+# (input, expected toString()) pairs
+_FRAC_CASES = (
+    ("2004-03-01T12:39:45.1Z", '2004-03-01T12:39:45.100000000Z'),
+    ("2004-03-01T12:39:45.01Z", '2004-03-01T12:39:45.010000000Z'),
+    ("2004-03-01T12:39:45.000000001Z", '2004-03-01T12:39:45.000000001Z'),  # nanosecond
+    ("2004-03-01T12:39:45.0000000001Z", '2004-03-01T12:39:45.000000000Z'),  # too small
+)
+
+_NEGATIVE_ISO_CASES = (
+    ("1969-03-01T00:00:32Z", '1969-03-01T00:00:32.000000000Z'),
+    ("1969-01-01T00:00:00Z", '1969-01-01T00:00:00.000000000Z'),
+    ("1969-01-01T00:00:40Z", '1969-01-01T00:00:40.000000000Z'),
+    ("1969-01-01T00:00:38Z", '1969-01-01T00:00:38.000000000Z'),
+    ("1969-03-01T12:39:45Z", '1969-03-01T12:39:45.000000000Z'),
+    ("1969-03-01T12:39:45.000000001Z", '1969-03-01T12:39:45.000000001Z'),
+    ("1969-03-01T12:39:45.12345Z", '1969-03-01T12:39:45.123450000Z'),
+    ("1969-03-01T12:39:45.123456Z", '1969-03-01T12:39:45.123456000Z'),
+)
+
+# (constructor arguments, expected toString()) pairs
+_NEGATIVE_NSECS_CASES = (
+    ((-1, _TAI), '1969-12-31T23:59:51.999918239Z'),
+    ((0, _TAI), '1969-12-31T23:59:51.999918240Z'),
+    ((1, _TAI), '1969-12-31T23:59:51.999918241Z'),
+    ((-1, _UTC), '1969-12-31T23:59:59.999999999Z'),
+    ((0, _UTC), '1970-01-01T00:00:00.000000000Z'),
+    ((1, _UTC), '1970-01-01T00:00:00.000000001Z'),
+)
+
 class DateTimeTestCase(unittest.TestCase):
     """A test case for DateTime."""
 
     def testMJD(self):
-        ts = DateTime(45205.125, DateTime.MJD, DateTime.UTC)
-        self.assertEqual(ts.nsecs(DateTime.UTC), 399006000000000000L)
-        self.assertEqual(ts.nsecs(DateTime.TAI), 399006021000000000L)
-        self.assertAlmostEqual(ts.get(DateTime.MJD, DateTime.UTC), 45205.125)
-        self.assertAlmostEqual(ts.get(DateTime.MJD, DateTime.TAI), 45205.125 + 21.0/86400.0)
+        ts = DateTime(45205.125, _MJD, _UTC)
+        self.assertEqual(ts.nsecs(_UTC), 399006000000000000)
+        self.assertEqual(ts.nsecs(_TAI), 399006021000000000)
+        self.assertAlmostEqual(ts.get(_MJD, _UTC), 45205.125)
+        self.assertAlmostEqual(ts.get(_MJD, _TAI), 45205.125 + 21.0/86400.0)
         # Following interface is deprecated
-        self.assertAlmostEqual(ts.mjd(DateTime.UTC), 45205.125)
-        self.assertAlmostEqual(ts.mjd(DateTime.TAI), 45205.125 + 21.0/86400.0)
+        self.assertAlmostEqual(ts.mjd(_UTC), 45205.125)
+        self.assertAlmostEqual(ts.mjd(_TAI), 45205.125 + 21.0/86400.0)
 
     def testLeapSecond(self):
         trials = ((45205., 21),
@@ -52,80 +94,93 @@ class DateTimeTestCase(unittest.TestCase):
                   (57204.01, 36),
                   (57000., 35),
                   (57210., 36))
-        for mjd, diff in trials:
-            ts = DateTime(mjd, DateTime.MJD, DateTime.UTC)
-            delta = ts.nsecs(DateTime.TAI) - ts.nsecs(DateTime.UTC)
-            self.assertEqual(delta/1E9, diff)
+        mjds = np.array([mjd for mjd, diff in trials])
+        diffs = np.array([diff for mjd, diff in trials], dtype=np.int64)
+        delta = DateTime.mjd_utc_to_nsecs_array(mjds, _TAI) - DateTime.mjd_utc_to_nsecs_array(mjds, _UTC)
+        np.testing.assert_array_equal(delta // 10**9, diffs)
+        np.testing.assert_array_equal(delta % 10**9, 0)
+        # The scalar constructor must agree
+        ts = DateTime(mjds[0], _MJD, _UTC)
+        self.assertEqual(ts.nsecs(_TAI) - ts.nsecs(_UTC), delta[0])
 
     def testNsecs(self):
-        ts = DateTime(1192755473000000000L, DateTime.UTC)
-        self.assertEqual(ts.nsecs(DateTime.UTC), 1192755473000000000L)
-        self.assertEqual(ts.nsecs(DateTime.TAI), 1192755506000000000L)
-        self.assertEqual(ts.nsecs(), 1192755506000000000L)
-        self.assertAlmostEqual(ts.get(DateTime.MJD, DateTime.UTC), 54392.040196759262)
+        ts = DateTime(_NS_UTC, _UTC)
+        self.assertEqual(ts.nsecs(_UTC), _NS_UTC)
+        self.assertEqual(ts.nsecs(_TAI), _NS_TAI)
+        self.assertEqual(ts.nsecs(), _NS_TAI)
+        self.assertAlmostEqual(ts.get(_MJD, _UTC), 54392.040196759262)
         ts2 = ts
         self.assertEqual(ts, ts2)
-        ts2 = DateTime(1192755473000000000L, DateTime.UTC)
+        ts2 = DateTime(_NS_UTC, _UTC)
         self.assertEqual(ts, ts2)
-        ts2 = DateTime(1234567890000000000L, DateTime.UTC)
+        ts2 = DateTime(1234567890000000000, _UTC)
         self.assertNotEqual(ts, ts2)
 
     def testBoundaryMJD(self):
-        ts = DateTime(47892.0, DateTime.MJD, DateTime.UTC)
-        self.assertEqual(ts.nsecs(DateTime.UTC), 631152000000000000L)
-        self.assertEqual(ts.nsecs(DateTime.TAI), 631152025000000000L)
-        self.assertEqual(ts.get(DateTime.MJD, DateTime.UTC), 47892.0)
+        ts = DateTime(47892.0, _MJD, _UTC)
+        self.assertEqual(ts.nsecs(_UTC), 631152000000000000)
+        self.assertEqual(ts.nsecs(_TAI), 631152025000000000)
+        self.assertEqual(ts.get(_MJD, _UTC), 47892.0)
 
     def testCrossBoundaryNsecs(self):
-        ts = DateTime(631151998000000000L, DateTime.UTC)
-        self.assertEqual(ts.nsecs(DateTime.UTC), 631151998000000000L)
-        self.assertEqual(ts.nsecs(DateTime.TAI), 631152023000000000L)
+        ts = DateTime(631151998000000000, _UTC)
+        self.assertEqual(ts.nsecs(_UTC), 631151998000000000)
+        self.assertEqual(ts.nsecs(_TAI), 631152022000000000)
 
     def testNsecsTAI(self):
-        ts = DateTime(1192755506000000000L, DateTime.TAI)
-        self.assertEqual(ts.nsecs(DateTime.UTC), 1192755473000000000L)
-        self.assertEqual(ts.nsecs(DateTime.TAI), 1192755506000000000L)
-        self.assertEqual(ts.nsecs(), 1192755506000000000L)
-        self.assertAlmostEqual(ts.get(DateTime.MJD, DateTime.UTC), 54392.040196759262)
+        ts = DateTime(_NS_TAI, _TAI)
+        self.assertEqual(ts.nsecs(_UTC), _NS_UTC)
+        self.assertEqual(ts.nsecs(_TAI), _NS_TAI)
+        self.assertEqual(ts.nsecs(), _NS_TAI)
+        self.assertAlmostEqual(ts.get(_MJD, _UTC), 54392.040196759262)
 
     def testNsecsDefault(self):
-        ts = DateTime(1192755506000000000L)
-        self.assertEqual(ts.nsecs(DateTime.UTC), 1192755473000000000L)
-        self.assertEqual(ts.nsecs(DateTime.TAI), 1192755506000000000L)
-        self.assertEqual(ts.nsecs(), 1192755506000000000L)
-        self.assertAlmostEqual(ts.get(DateTime.MJD, DateTime.UTC), 54392.040196759262)
+        ts = DateTime(_NS_TAI)
+        self.assertEqual(ts.nsecs(_UTC), _NS_UTC)
+        self.assertEqual(ts.nsecs(_TAI), _NS_TAI)
+        self.assertEqual(ts.nsecs(), _NS_TAI)
+        self.assertAlmostEqual(ts.get(_MJD, _UTC), 54392.040196759262)
+
+    def testIntegerCodes(self):
+        # Scale and system can be given as integer codes, as from C++
+        ts = DateTime(_NS_TAI)
+        for code in (1, np.int32(1), np.int64(1)):
+            self.assertEqual(ts.nsecs(code), _NS_UTC)
+            self.assertAlmostEqual(ts.get(code, code), 54392.040196759262)
+        self.assertRaises(ValueError, ts.nsecs, 3)
+        self.assertRaises(ValueError, ts.nsecs, 1.)
 
     def testNow(self):
         successes = 0
-        for i in xrange(10):       # pylint: disable-msg=W0612
-            secs = time.time()
+        for _ in repeat(None, 10):
+            secs_ns = _time_ns()
             ts = DateTime.now()
-            diff = ts.nsecs(DateTime.UTC) / 1.0e9 - secs 
-            if diff > -0.001 and diff < 0.1:
+            diff_ns = ts.nsecs(_UTC) - secs_ns
+            if diff_ns > -1000000 and diff_ns < 100000000:
                 successes += 1
         self.assertGreaterEqual(successes, 3)
 
     def testIsoEpoch(self):
         ts = DateTime("19700101T000000Z")
-        self.assertEqual(ts.nsecs(DateTime.UTC), 0L)
+        self.assertEqual(ts.nsecs(_UTC), 0)
         self.assertEqual(ts.toString(), "1970-01-01T00:00:00.000000000Z")
 
     def testIsoBasic(self):
         ts = DateTime("20090402T072639.314159265Z")
-        self.assertEqual(ts.nsecs(DateTime.TAI), 1238657233314159265L)
-        self.assertEqual(ts.nsecs(DateTime.UTC), 1238657199314159265L)
+        self.assertEqual(ts.nsecs(_TAI), 1238657233314159265)
+        self.assertEqual(ts.nsecs(_UTC), 1238657199314159265)
         self.assertEqual(ts.toString(), "2009-04-02T07:26:39.314159265Z")
 
     def testIsoExpanded(self):
         ts = DateTime("2009-04-02T07:26:39.314159265Z")
-        self.assertEqual(ts.nsecs(DateTime.TAI), 1238657233314159265L)
-        self.assertEqual(ts.nsecs(DateTime.UTC), 1238657199314159265L)
+        self.assertEqual(ts.nsecs(_TAI), 1238657233314159265)
+        self.assertEqual(ts.nsecs(_UTC), 1238657199314159265)
         self.assertEqual(ts.toString(), "2009-04-02T07:26:39.314159265Z")
 
     def testIsoNoNSecs(self):
         ts = DateTime("2009-04-02T07:26:39Z")
-        self.assertEqual(ts.nsecs(DateTime.TAI), 1238657233000000000L)
-        self.assertEqual(ts.nsecs(DateTime.UTC), 1238657199000000000L)
+        self.assertEqual(ts.nsecs(_TAI), 1238657233000000000)
+        self.assertEqual(ts.nsecs(_UTC), 1238657199000000000)
         self.assertEqual(ts.toString(), "2009-04-02T07:26:39.000000000Z")
 
     def xtestIsoThrow(self):
@@ -138,57 +193,45 @@ class DateTimeTestCase(unittest.TestCase):
         self.assertRaises(pexExcept.DomainError, lambda: DateTime("2009/04/01T23:36:05Z"))
 
     def testNsecsTT(self):
-        ts = DateTime(1192755538184000000L, DateTime.TT)
-        self.assertEqual(ts.nsecs(DateTime.UTC), 1192755473000000000L)
-        self.assertEqual(ts.nsecs(DateTime.TAI), 1192755506000000000L)
-        self.assertEqual(ts.nsecs(), 1192755506000000000L)
-        self.assertAlmostEqual(ts.get(DateTime.MJD, DateTime.UTC), 54392.040196759262)
+        ts = DateTime(1192755538184000000, _TT)
+        self.assertEqual(ts.nsecs(_UTC), _NS_UTC)
+        self.assertEqual(ts.nsecs(_TAI), _NS_TAI)
+        self.assertEqual(ts.nsecs(), _NS_TAI)
+        self.assertAlmostEqual(ts.get(_MJD, _UTC), 54392.040196759262)
+
+    def testNsecsArray(self):
+        nsecs = np.array([_NS_UTC, 631151998000000000, 1238657199314159265, -1])
+        ts = DateTime.from_nsecs_array(nsecs, _UTC)
+        np.testing.assert_array_equal(ts.nsecs_array(_UTC), nsecs)
+        np.testing.assert_array_equal(ts.nsecs_array(_TAI)[0:3],
+                                      [_NS_TAI, 631152022000000000, 1238657233314159265])
+        self.assertAlmostEqual(ts.get(_MJD, _UTC)[0], 54392.040196759262)
+        ts = DateTime.from_nsecs_array(nsecs, _TAI)
+        np.testing.assert_array_equal(ts.nsecs_array(_TAI), nsecs)
+        # Scalars are treated as single element arrays
+        for scale in (_UTC, _TAI):
+            ts = DateTime.from_nsecs_array(_NS_UTC, scale)
+            np.testing.assert_array_equal(ts.nsecs_array(scale), [_NS_UTC])
+
+    def testBatch(self):
+        nsecs = [_NS_UTC, 1238657199314159265, -1]
+        for ts, n in zip(DateTime.batch(nsecs, _UTC), nsecs):
+            self.assertEqual(ts, DateTime(n, _UTC))
+            self.assertEqual(ts.nsecs(_UTC), n)
 
     def testFracSecs(self):
-        ts = DateTime("2004-03-01T12:39:45.1Z")
-        self.assertEqual(ts.toString(), '2004-03-01T12:39:45.100000000Z')
-        ts = DateTime("2004-03-01T12:39:45.01Z")
-        self.assertEqual(ts.toString(), '2004-03-01T12:39:45.010000000Z')
-        ts = DateTime("2004-03-01T12:39:45.000000001Z") # nanosecond
-        self.assertEqual(ts.toString(), '2004-03-01T12:39:45.000000001Z')
-        ts = DateTime("2004-03-01T12:39:45.0000000001Z") # too small
-        self.assertEqual(ts.toString(), '2004-03-01T12:39:45.000000000Z')
+        for iso, expected in _FRAC_CASES:
+            self.assertEqual(DateTime(iso).toString(), expected, iso)
 
     def testNegative(self):
-        ts = DateTime("1969-03-01T00:00:32Z")
-        self.assertEqual(ts.toString(), '1969-03-01T00:00:32.000000000Z')
-        ts = DateTime("1969-01-01T00:00:00Z")
-        self.assertEqual(ts.toString(), '1969-01-01T00:00:00.000000000Z')
-        ts = DateTime("1969-01-01T00:00:40Z")
-        self.assertEqual(ts.toString(), '1969-01-01T00:00:40.000000000Z')
-        ts = DateTime("1969-01-01T00:00:38Z")
-        self.assertEqual(ts.toString(), '1969-01-01T00:00:38.000000000Z')
-        ts = DateTime("1969-03-01T12:39:45Z")
-        self.assertEqual(ts.toString(), '1969-03-01T12:39:45.000000000Z')
-        ts = DateTime("1969-03-01T12:39:45.000000001Z")
-        self.assertEqual(ts.toString(), '1969-03-01T12:39:45.000000001Z')
-
-        ts = DateTime("1969-03-01T12:39:45.12345Z")
-        self.assertEqual(ts.toString(), '1969-03-01T12:39:45.123450000Z')
-        ts = DateTime("1969-03-01T12:39:45.123456Z")
-        self.assertEqual(ts.toString(), '1969-03-01T12:39:45.123456000Z')
+        for iso, expected in _NEGATIVE_ISO_CASES:
+            self.assertEqual(DateTime(iso).toString(), expected, iso)
 
         ts = DateTime()
         self.assertEqual(ts.toString(), '1969-12-31T23:59:51.999918240Z')
 
-        ts = DateTime(-1L, DateTime.TAI)
-        self.assertEqual(ts.toString(), '1969-12-31T23:59:51.999918239Z')
-        ts = DateTime(0L, DateTime.TAI)
-        self.assertEqual(ts.toString(), '1969-12-31T23:59:51.999918240Z')
-        ts = DateTime(1L, DateTime.TAI)
-        self.assertEqual(ts.toString(), '1969-12-31T23:59:51.999918241Z')
-
-        ts = DateTime(-1L, DateTime.UTC)
-        self.assertEqual(ts.toString(), '1969-12-31T23:59:59.999999999Z')
-        ts = DateTime(0L, DateTime.UTC)
-        self.assertEqual(ts.toString(), '1970-01-01T00:00:00.000000000Z')
-        ts = DateTime(1L, DateTime.UTC)
-        self.assertEqual(ts.toString(), '1970-01-01T00:00:00.000000001Z')
+        for args, expected in _NEGATIVE_NSECS_CASES:
+            self.assertEqual(DateTime(*args).toString(), expected, args)
 
     def testConvert(self):
         year = 2012
@@ -198,8 +241,8 @@ class DateTimeTestCase(unittest.TestCase):
         minute = 29
         second = 33
 
-        ts = DateTime(year, month, day, hour, minute, second, DateTime.UTC)
-        dt = ts.toPython(DateTime.UTC)
+        ts = DateTime(year, month, day, hour, minute, second, _UTC)
+        dt = ts.toPython(_UTC)
 
         self.assertEqual(dt.year, year)
         self.assertEqual(dt.month, month)
@@ -208,17 +251,27 @@ class DateTimeTestCase(unittest.TestCase):
         self.assertEqual(dt.minute, minute)
         self.assertEqual(dt.second, second)
 
+        ts = DateTime(year, month, day, hour, minute, 5.25, _UTC)
+        self.assertEqual(ts.toString(), "2012-07-19T18:29:05.250000000Z")
+        ts = DateTime(year, month, day, hour, minute, np.float32(5.25), _UTC)
+        self.assertEqual(ts.toString(), "2012-07-19T18:29:05.250000000Z")
+
 class TimeZoneBaseTestCase(DateTimeTestCase):
     timezone = ""
-    def setUp(self):
-        self.tz = os.environ.setdefault('TZ', "")
-        os.environ['TZ'] = self.timezone
 
-    def tearDown(self):
-        if self.tz == "":
+    @classmethod
+    def setUpClass(cls):
+        cls._saved_tz = os.environ.get('TZ')
+        os.environ['TZ'] = cls.timezone
+        time.tzset()
+
+    @classmethod
+    def tearDownClass(cls):
+        if cls._saved_tz is None:
             del os.environ['TZ']
         else:
-            os.environ['TZ'] = self.tz
+            os.environ['TZ'] = cls._saved_tz
+        time.tzset()
 
 class BritishTimeTestCase(TimeZoneBaseTestCase):
     timezone = "Europe/London"
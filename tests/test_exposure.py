@@ -28,14 +28,23 @@ import lsstx.image as image
 import lsstx.geom as geom
 import numpy as np
 import copy
+import os
+import shutil
+import tempfile
 
-# Some tests use SWIGged objects
-import lsst.afw.image as afwImage
+# Replacement variance pixels, in the variance plane's data type
+_VAR_PATCH = np.array([[2, 4], [5, 6]], dtype=np.float32)
 
 class TestExposure(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        # Tests take deep copies of these so that they can modify them
+        cls._exp_i32 = image.Exposure(32, 40, dtype=np.int32)
+        cls._exp_f32 = image.Exposure(32, 40, dtype=np.float32)
+
     def test_Basic(self):
-        exp = image.Exposure(32, 40, dtype=np.int32)
+        exp = copy.deepcopy(self._exp_i32)
         self.assertEqual(exp.height, 40)
         self.assertEqual(exp.width, 32)
         self.assertFalse(exp.has_wcs())
@@ -61,13 +70,39 @@ class TestExposure(unittest.TestCase):
         self.assertIsInstance(bb, geom.Box2I)
         self.assertEqual(bb.area, 6)
 
+    def test_ReadFitsBatch(self):
+        # Data type is checked before any file is opened
+        self.assertRaises(ValueError, image.Exposure.read_fits_batch,
+                          ["does_not_exist.fits"], dtype=np.int16)
+
+        exp = copy.deepcopy(self._exp_f32)
+        exp.masked_image[1, 2] = (5, 1, 3)
+        tmpdir = tempfile.mkdtemp()
+        try:
+            filenames = [os.path.join(tmpdir, "exp{}.fits".format(i)) for i in range(2)]
+            for f in filenames:
+                exp.write_fits(f)
+            exposures = image.Exposure.read_fits_batch(filenames, dtype=np.float32)
+        finally:
+            shutil.rmtree(tmpdir)
+        self.assertEqual(len(exposures), 2)
+        for e in exposures:
+            self.assertIsInstance(e, image.Exposure)
+            self.assertEqual(e.width, 32)
+            self.assertEqual(e.height, 40)
+            self.assertEqual(e.masked_image[1, 2][0], 5)
+
     def test_MaskedImage(self):
-        exp = image.Exposure(32, 40, dtype=np.float32)
+        exp = copy.deepcopy(self._exp_f32)
         e = image.make_exposure(exp.masked_image)
 
         self.assertEqual(e.width, 32)
         self.assertEqual(e.height, 40)
 
+        exposures = image.make_exposures([exp.masked_image, exp.masked_image])
+        self.assertEqual(len(exposures), 2)
+        self.assertEqual(exposures[1].width, 32)
+
         mi = image.MaskedImage(64, 128)
         e.masked_image = mi
         self.assertEqual(e.width, 64)
@@ -85,21 +120,67 @@ class TestExposure(unittest.TestCase):
         self.assertEqual(mask, 2)
         self.assertEqual(var, 3)
 
+        packed = mi.packed()
+        self.assertEqual(packed.shape, arrays[0].shape)
+        self.assertEqual(packed[0, 0]["image"], 1)
+        self.assertEqual(packed[0, 0]["mask"], 2)
+        self.assertEqual(packed[0, 0]["variance"], 3)
+
+        def scale_kernel(image, mask, variance, factor):
+            image *= factor
+            mask |= 4
+            variance *= factor**2
+            return image.sum()
+
+        total = mi.map_inplace(scale_kernel, 2)
+        self.assertEqual(total, 2)
+        data, mask, var = mi[0, 0]
+        self.assertEqual(data, 2)
+        self.assertEqual(mask, 6)
+        self.assertEqual(var, 12)
+
         extent = mi.dimensions
         self.assertIsInstance(extent, geom.Extent2I)
 
         var_as_image = mi.variance
-        var_as_image[1:3,1:3] = np.array([[2,4],[5,6]])
+        var_as_image[1:3,1:3] = _VAR_PATCH
         self.assertEqual(var_as_image[2,2], 6)
 
+        # Releasing a MaskedImage obtained from an Exposure leaves the
+        # Exposure able to hand out a usable one
+        exp.masked_image[0, 0] = (4, 0, 1)
+        exp.masked_image.release()
+        data, mask, var = exp.masked_image[0, 0]
+        self.assertEqual(data, 4)
+        self.assertEqual(len(exp.masked_image.arrays), 3)
+
+
+    def test_ExposurePy(self):
+        src = image.ExposurePy(64, 128)
+        self.assertEqual(src.masked_image.dimensions, geom.Extent2I(64, 128))
+        shallow = image.ExposurePy(src)
+        deep = image.ExposurePy(src, deep=True)
+
+        # Only the shallow copy sees changes to the source pixels
+        src.masked_image[0, 0] = (1, 2, 3)
+        self.assertEqual(shallow.masked_image[0, 0][0], 1)
+        self.assertEqual(deep.masked_image[0, 0][0], 0)
+        self.assertEqual(deep.masked_image.dimensions, geom.Extent2I(64, 128))
 
     def test_ExposureInfo(self):
+        # Only this test needs SWIGged objects directly
+        import lsst.afw.image as afwImage
         cal = afwImage.Calib()
         ei = image.ExposureInfo(calib=cal)
         ei2 = image.ExposureInfo(info=ei)
         self.assertTrue(ei2.has_calib())
         self.assertFalse(ei2.has_wcs())
 
+        ei3 = copy.deepcopy(ei)
+        self.assertIsInstance(ei3, image.ExposureInfo)
+        self.assertTrue(ei3.has_calib())
+        self.assertIsNot(ei3.calib, ei.calib)
+
 
 if __name__ == '__main__':
     unittest.main()
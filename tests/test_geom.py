@@ -29,95 +29,58 @@ import lsstx.geom as geom
 import numpy as np
 import copy
 
-# Needed until we fix repr()
-from lsstx.geom import Box2D, Point2D, Extent2D, Extent3D
+# Namespace for evaluating repr() output, which uses unqualified class names
+_EVAL_GLOBALS = dict(vars(geom))
 
 
 class TestExtent(unittest.TestCase):
 
-    def test_Typed2(self):
-        ei = geom.Extent2I(1, 2)
-        self.assertEqual(ei.x, 1)
-        self.assertEqual(ei.y, 2)
+    def _exercise_typed(self, make_i, make_d, coords):
+        """
+        Shared checks for the typed Extent classes of the dimensionality
+        given by the length of coords.
+        """
+        ndims = len(coords)
+        ei = make_i(*coords)
+        self.assertSequenceEqual(ei, coords)
+        # Coordinate properties agree with sequence access
+        self.assertSequenceEqual([getattr(ei, name) for name in "xyz"[:ndims]], coords)
         e2 = copy.deepcopy(ei)
         self.assertEqual(ei, e2)
 
         # Create D from I
-        ed = geom.Extent2D(ei)
-        self.assertEqual(ed.x, 1)
-        self.assertEqual(ed.y, 2)
+        ed = make_d(ei)
+        self.assertSequenceEqual(ed, coords)
 
         # Test the methods
-        ed1 = geom.Extent2D(3.5, 0)
+        ed1 = make_d(*((0,) * (ndims - 1) + (3.5,)))
 
         self.assertAlmostEqual(ed1.compute_norm(), 3.5, 10)
         self.assertAlmostEqual(ed1.compute_squared_norm(), 12.25, 10)
         self.assertRaises(TypeError, ei.compute_norm)
-        self.assertEqual(ei.compute_squared_norm(), 5)
-
-        ei1 = geom.Extent2I(1, 2)
-        ei2 = geom.Extent2I(3, 4)
-        self.assertEqual(ei1.x, 1)
-        self.assertEqual(ei1.y, 2)
-        self.assertEqual(ei2.x, 3)
-        self.assertEqual(ei2.y, 4)
+        self.assertEqual(ei.compute_squared_norm(), sum(c * c for c in coords))
+
+        other = tuple(c + ndims for c in coords)
+        ei1 = make_i(*coords)
+        ei2 = make_i(*other)
+        self.assertSequenceEqual(ei1, coords)
+        self.assertSequenceEqual(ei2, other)
         ei1.swap(ei2)
-        self.assertEqual(ei1.x, 3)
-        self.assertEqual(ei1.y, 4)
-        self.assertEqual(ei2.x, 1)
-        self.assertEqual(ei2.y, 2)
+        self.assertSequenceEqual(ei1, other)
+        self.assertSequenceEqual(ei2, coords)
 
         # Can not create I from D though
-        self.assertRaises(NotImplementedError, geom.Extent2I, ed)
+        self.assertRaises(NotImplementedError, make_i, ed)
 
-        # Create object using repr. TODO: Fix prefix
-        r = eval(repr(ed))
+        # Create object using repr
+        r = eval(repr(ed), _EVAL_GLOBALS)
         self.assertEqual(r, ed)
 
-    def test_Typed3(self):
-        ei = geom.Extent3I(1, 2, 3)
-        self.assertEqual(ei.x, 1)
-        self.assertEqual(ei.y, 2)
-        self.assertEqual(ei.z, 3)
-        e2 = copy.deepcopy(ei)
-        self.assertEqual(ei, e2)
-
-        # Create D from I
-        ed = geom.Extent3D(ei)
-        self.assertEqual(ed.x, 1)
-        self.assertEqual(ed.y, 2)
-        self.assertEqual(ed.z, 3)
-
-        # Test the methods
-        ed1 = geom.Extent3D(0, 3.5, 0)
-
-        self.assertAlmostEqual(ed1.compute_norm(), 3.5, 10)
-        self.assertAlmostEqual(ed1.compute_squared_norm(), 12.25, 10)
-        self.assertRaises(TypeError, ei.compute_norm)
-        self.assertEqual(ei.compute_squared_norm(), 14)
-
-        ei1 = geom.Extent3I(1, 2, 3)
-        ei2 = geom.Extent3I(4, 5, 6)
-        self.assertEqual(ei1.x, 1)
-        self.assertEqual(ei1.y, 2)
-        self.assertEqual(ei1.z, 3)
-        self.assertEqual(ei2.x, 4)
-        self.assertEqual(ei2.y, 5)
-        self.assertEqual(ei2.z, 6)
-        ei1.swap(ei2)
-        self.assertEqual(ei1.x, 4)
-        self.assertEqual(ei1.y, 5)
-        self.assertEqual(ei1.z, 6)
-        self.assertEqual(ei2.x, 1)
-        self.assertEqual(ei2.y, 2)
-        self.assertEqual(ei2.z, 3)
-
-        # Can not create I from D though
-        self.assertRaises(NotImplementedError, geom.Extent3I, ed)
+    def test_Typed2(self):
+        self._exercise_typed(geom.Extent2I, geom.Extent2D, (1, 2))
 
-        # Create object using repr. TODO: Fix prefix
-        r = eval(repr(ed))
-        self.assertEqual(r, ed)
+    def test_Typed3(self):
+        self._exercise_typed(geom.Extent3I, geom.Extent3D, (1, 2, 3))
 
     def test_Untyped(self):
         ed = geom.Extent(1, 2, 3)
@@ -144,106 +107,65 @@ class TestExtent(unittest.TestCase):
 
 class TestPoint(unittest.TestCase):
 
-    def test_Typed2(self):
-        pi = geom.Point2I(1, 2)
-        self.assertEqual(pi.x, 1)
-        self.assertEqual(pi.y, 2)
+    def _exercise_typed(self, make_i, make_d, coords, other):
+        """
+        Shared checks for the typed Point classes of the dimensionality
+        given by the length of coords.
+        """
+        ndims = len(coords)
+        pi = make_i(*coords)
+        self.assertSequenceEqual(pi, coords)
+        # Coordinate properties agree with sequence access
+        self.assertSequenceEqual([getattr(pi, name) for name in "xyz"[:ndims]], coords)
         p2 = copy.deepcopy(pi)
         self.assertEqual(pi, p2)
 
         # Create D from I
-        pd = geom.Point2D(pi)
-        self.assertEqual(pd.x, 1)
-        self.assertEqual(pd.y, 2)
+        pd = make_d(pi)
+        self.assertSequenceEqual(pd, coords)
 
         # Create I from D
-        pi = geom.Point2I(pd)
-        self.assertEqual(pi.x, 1)
-        self.assertEqual(pi.y, 2)
+        pi = make_i(pd)
+        self.assertSequenceEqual(pi, coords)
 
         # Test the methods
-        pi1 = geom.Point2I(1, 2)
-        pi2 = geom.Point2I(3, 4)
-        self.assertEqual(pi1.x, 1)
-        self.assertEqual(pi1.y, 2)
-        self.assertEqual(pi2.x, 3)
-        self.assertEqual(pi2.y, 4)
+        pi1 = make_i(*coords)
+        pi2 = make_i(*other)
+        self.assertSequenceEqual(pi1, coords)
+        self.assertSequenceEqual(pi2, other)
         pi1.swap(pi2)
-        self.assertEqual(pi1.x, 3)
-        self.assertEqual(pi1.y, 4)
-        self.assertEqual(pi2.x, 1)
-        self.assertEqual(pi2.y, 2)
+        self.assertSequenceEqual(pi1, other)
+        self.assertSequenceEqual(pi2, coords)
 
-        pi1 = geom.Point2I(3, 0)
-        pi2 = geom.Point2I(0, 4)
+        pi1 = make_i(*((3,) + (0,) * (ndims - 1)))
+        pi2 = make_i(*((0,) * (ndims - 1) + (4,)))
         self.assertEqual(pi1.distance_squared(pi2), 25)
 
         pi1.scale(2)
         pi2.scale(2)
         self.assertEqual(pi1.distance_squared(pi2), 100)
 
-        ei = geom.Extent(1, 1)
+        ei = geom.Extent(*((1,) * ndims))
         pi1.shift(ei)
         pi2.shift(ei)
         self.assertEqual(pi1.distance_squared(pi2), 100)
 
-        # Create object using repr. TODO: Fix prefix
-        r = eval("geom."+repr(pd))
-        self.assertEqual(r, pd)
+        # Setters only modify their own coordinate
+        pi1 = make_i(*coords)
+        pi1.y = 5
+        self.assertSequenceEqual(pi1, (coords[0], 5) + coords[2:])
+        pi1.x = 7
+        self.assertSequenceEqual(pi1, (7, 5) + coords[2:])
 
-    def test_Typed3(self):
-        pi = geom.Point3I(1, 2, 3)
-        self.assertEqual(pi.x, 1)
-        self.assertEqual(pi.y, 2)
-        self.assertEqual(pi.z, 3)
-        p2 = copy.deepcopy(pi)
-        self.assertEqual(pi, p2)
-
-        # Create D from I
-        pd = geom.Point3D(pi)
-        self.assertEqual(pd.x, 1)
-        self.assertEqual(pd.y, 2)
-        self.assertEqual(pd.z, 3)
-
-        # Create I from D
-        pi = geom.Point3I(pd)
-        self.assertEqual(pi.x, 1)
-        self.assertEqual(pi.y, 2)
-        self.assertEqual(pi.z, 3)
-
-        # Test the methods
-        pi1 = geom.Point3I(1, 2, 0)
-        pi2 = geom.Point3I(3, 4, 6)
-        self.assertEqual(pi1.x, 1)
-        self.assertEqual(pi1.y, 2)
-        self.assertEqual(pi1.z, 0)
-        self.assertEqual(pi2.x, 3)
-        self.assertEqual(pi2.y, 4)
-        self.assertEqual(pi2.z, 6)
-        pi1.swap(pi2)
-        self.assertEqual(pi1.x, 3)
-        self.assertEqual(pi1.y, 4)
-        self.assertEqual(pi2.x, 1)
-        self.assertEqual(pi2.y, 2)
-        self.assertEqual(pi1.z, 6)
-        self.assertEqual(pi2.z, 0)
-
-        pi1 = geom.Point3I(3, 0, 0)
-        pi2 = geom.Point3I(0, 0, 4)
-        self.assertEqual(pi1.distance_squared(pi2), 25)
-
-        pi1.scale(2)
-        pi2.scale(2)
-        self.assertEqual(pi1.distance_squared(pi2), 100)
+        # Create object using repr
+        r = eval(repr(pd), _EVAL_GLOBALS)
+        self.assertEqual(r, pd)
 
-        ei = geom.Extent(1, 1, 1)
-        pi1.shift(ei)
-        pi2.shift(ei)
-        self.assertEqual(pi1.distance_squared(pi2), 100)
+    def test_Typed2(self):
+        self._exercise_typed(geom.Point2I, geom.Point2D, (1, 2), (3, 4))
 
-        # Create object using repr. TODO: Fix prefix
-        r = eval("geom."+repr(pd))
-        self.assertEqual(r, pd)
+    def test_Typed3(self):
+        self._exercise_typed(geom.Point3I, geom.Point3D, (1, 2, 0), (3, 4, 6))
 
     def test_Untyped(self):
         pd = geom.Point(1, 2, 3)
@@ -264,12 +186,10 @@ class TestPoint(unittest.TestCase):
         self.assertNotEqual(p, pb)
         o = geom.Extent(3, 2)
         p += o
-        self.assertEqual(p.x, 4)
-        self.assertEqual(p.y, 4)
+        self.assertSequenceEqual(p, (4, 4))
 
         p -= o
-        self.assertEqual(p.x, 1)
-        self.assertEqual(p.y, 2)
+        self.assertSequenceEqual(p, (1, 2))
 
         p2 = p + o
         self.assertGreater(p2, p)
@@ -306,11 +226,45 @@ class TestPoint(unittest.TestCase):
         ce3 = ce & ce2
         self.assertSequenceEqual(ce3, (False, False))
 
+        # Comparisons require operands of the same type
+        for other in (geom.Extent(3, 4), geom.Point(3., 4.), geom.Point(3, 4, 5)):
+            self.assertRaises(TypeError, lambda: p < other)
+            self.assertRaises(TypeError, lambda: p >= other)
+        self.assertRaises(TypeError, lambda: geom.Point(1, 2, 3) > p)
+
+        c = geom.CoordinateExpr(2, val=True)
+        c2 = copy.deepcopy(c)
+        self.assertSequenceEqual(c2, (True, True))
+        c2[0] = False
+        self.assertSequenceEqual(c, (True, True))
+        self.assertSequenceEqual(c2, (False, True))
+
         c = geom.CoordinateExpr(3, val=True)
         self.assertTrue(c.all_true())
         c = geom.CoordinateExpr(3, val=False)
         self.assertFalse(c.all_true())
 
+    def test_CompareAll(self):
+        points = [geom.Point(1, 2), geom.Point(5, 1), geom.Point(3, 4)]
+        others = [geom.Point(2, 3), geom.Point(6, 1), geom.Point(1, 1)]
+        self.assertEqual(geom.to_ndarray(points).shape, (3, 2))
+        expected = [p < o for p, o in zip(points, others)]
+        self.assertSequenceEqual(list(geom.compare_all(points, others, "lt")), expected)
+        expected = [p >= o for p, o in zip(points, others)]
+        self.assertSequenceEqual(list(geom.compare_all(points, others, "ge")), expected)
+        self.assertSequenceEqual(list(geom.compare_all(points, geom.Point(4, 4), "le")),
+                                 [True, False, True])
+        self.assertRaises(ValueError, geom.compare_all, points, others, "eq")
+        # Mixed types are not silently converted
+        self.assertRaises(ValueError, geom.to_ndarray, points + [geom.Point(1., 2.)])
+        self.assertRaises(ValueError, geom.to_ndarray, points + [geom.Point(1, 2, 3)])
+        self.assertRaises(ValueError, geom.compare_all, points, others[:2] + [geom.Extent(1, 2)], "lt")
+        # Operands must be comparable and of matching length
+        extents = [geom.Extent(2, 3), geom.Extent(6, 1), geom.Extent(1, 1)]
+        self.assertRaises(TypeError, geom.compare_all, points, extents, "lt")
+        self.assertRaises(TypeError, geom.compare_all, points, [geom.Point(1., 1.)], "lt")
+        self.assertRaises(ValueError, geom.compare_all, points, others[:2], "lt")
+
 
 class TestBox(unittest.TestCase):
 
@@ -335,7 +289,7 @@ class TestBox(unittest.TestCase):
         self.assertEqual(bd.center_y, 2.0)
 
         # Create object using repr.
-        r = eval(repr(bd))
+        r = eval(repr(bd), _EVAL_GLOBALS)
         self.assertEqual(r, bd)
 
 